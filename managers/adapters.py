@@ -21,13 +21,22 @@ class AiAgentAdapter:
         self.google_services_manager = google_services_manager
         self.logger = logger
 
-    async def add_reminder(self, user_id: str, cron: str, message: str) -> int:
+    async def add_reminder(self, user_id: str, cron: str, message: str) -> int | str:
         self.logger(
             f'AiAgentAdapter: Adding reminder for user {user_id}: "{message}" with cron "{cron}"',
             'info',
         )
-        reminder_id = await self.storage_manager.add_reminder(user_id, cron, message)
-        await self.schedule_manager.add_reminder(reminder_id, user_id, cron, message)
+        telegram_chat_id = await self.storage_manager.get_telegram_id_for_google_sub(user_id)
+        if not telegram_chat_id:
+            self.logger(f'AiAgentAdapter: No Telegram chat linked for user {user_id}', 'warning')
+            return 'Failed to save reminder: Telegram account not linked.'
+
+        reminder_id = await self.storage_manager.add_reminder(
+            user_id, cron, message, telegram_chat_id
+        )
+        await self.schedule_manager.add_reminder(
+            reminder_id, user_id, cron, message, telegram_chat_id
+        )
         self.logger(f'AiAgentAdapter: Reminder {reminder_id} added for user {user_id}', 'debug')
         return reminder_id
 
@@ -42,15 +51,10 @@ class AiAgentAdapter:
     ) -> dict[str, Any] | str:
         self.logger(f'AiAgentAdapter: Creating event for user {user_id}: "{event_name}"', 'info')
 
-        token_data = await self.storage_manager.get_user_token(user_id)
-        if not token_data:
-            self.logger(f'AiAgentAdapter: User token not found for user {user_id}', 'error')
-            return 'Failed to create event: User not authenticated.'
-
-        access_token = token_data.get('access_token')
+        access_token = await self.storage_manager.get_access_token(user_id)
         if not access_token:
             self.logger(f'AiAgentAdapter: Access token not found for user {user_id}', 'error')
-            return 'Failed to create event: Access token not found.'
+            return 'Failed to create event: User not authenticated.'
 
         result = await self.google_services_manager.create_calendar_event(
             access_token,
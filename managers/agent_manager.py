@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
-from zoneinfo import ZoneInfo
 
 from pydantic_ai import Agent, FunctionToolset, ModelMessagesTypeAdapter, RunContext
 from pydantic_ai.messages import ModelMessage
@@ -9,7 +8,8 @@ from pydantic_ai.models.google import GoogleModel
 from pydantic_ai.providers.google import GoogleProvider
 
 from protocols import AgentServices
-from utils import LogFunction, get_current_datetime
+from utils import LogFunction, get_current_datetime, get_zoneinfo
+from utils.tasks import TaskCoordinator
 
 
 @dataclass
@@ -39,15 +39,18 @@ STATIC_INSTRUCTIONS = (
 
 
 def add_context_info(ctx: RunContext[AgentDeps]) -> str:
-    user_tz = ZoneInfo(ctx.deps.user_timezone)
+    user_tz = get_zoneinfo(ctx.deps.user_timezone)
     now = datetime.now(user_tz)
     current_datetime = now.strftime('%Y-%m-%d %H:%M')
     return f'Current datetime: {current_datetime}\nUser timezone: {ctx.deps.user_timezone}\nUser email: {ctx.deps.user_email}'
 
 
 async def save_reminder(ctx: RunContext[AgentDeps], cron: str, message: str) -> str:
-    reminder_id = await ctx.deps.services.add_reminder(ctx.deps.user_id, cron, message)
-    return f'Reminder saved with ID: {reminder_id}'
+    result = await ctx.deps.services.add_reminder(ctx.deps.user_id, cron, message)
+    if isinstance(result, str):
+        return result
+
+    return f'Reminder saved with ID: {result}'
 
 
 async def save_to_google_calendar(
@@ -60,7 +63,7 @@ async def save_to_google_calendar(
     try:
         start_dt = datetime.fromisoformat(event_datetime)
         end_dt = start_dt + timedelta(minutes=duration_minutes)
-        event_timezone = ZoneInfo(ctx.deps.user_timezone)
+        event_timezone = get_zoneinfo(ctx.deps.user_timezone)
     except ValueError:
         return 'Invalid date format. Please use ISO format.'
 
@@ -88,20 +91,37 @@ global_function_toolset = FunctionToolset(
 )
 
 
+HISTORY_MAX_MESSAGES = 10
+AGENT_CONCURRENCY = 8
+
+validate_model_messages = ModelMessagesTypeAdapter.validate_python
+dump_model_messages = ModelMessagesTypeAdapter.dump_python
+
+
 def convert_to_model_messages(messages: list[dict[str, Any]]) -> list[ModelMessage]:
-    return ModelMessagesTypeAdapter.validate_python(messages)
+    return validate_model_messages(messages)
 
 
 def convert_from_model_messages(messages: list[ModelMessage]) -> list[dict[str, Any]]:
-    return ModelMessagesTypeAdapter.dump_python(messages, mode='json')
+    return dump_model_messages(messages, mode='json')
+
+
+def create_google_model(google_api_key: str) -> GoogleModel:
+    provider = GoogleProvider(api_key=google_api_key)
+    return GoogleModel('models/gemini-flash-latest', provider=provider)
 
 
 class AgentManager:
-    def __init__(self, google_api_key: str, services: AgentServices, logger: LogFunction):
+    def __init__(
+        self,
+        model: GoogleModel,
+        services: AgentServices,
+        logger: LogFunction,
+        coordinator: TaskCoordinator,
+    ):
         self.services = services
         self.logger = logger
-        provider = GoogleProvider(api_key=google_api_key)
-        model = GoogleModel('models/gemini-flash-latest', provider=provider)
+        self.coordinator = coordinator
 
         self.agent = Agent(
             model,
@@ -118,6 +138,16 @@ class AgentManager:
         user_id: str,
         user_email: str,
         user_timezone: str,
+    ) -> str:
+        async with self.coordinator.exclusive(f'agent:{user_id}'):
+            return await self.run_turn(user_message, user_id, user_email, user_timezone)
+
+    async def run_turn(
+        self,
+        user_message: str,
+        user_id: str,
+        user_email: str,
+        user_timezone: str,
     ) -> str:
         deps = AgentDeps(
             user_id=user_id,
@@ -126,13 +156,27 @@ class AgentManager:
             services=self.services,
         )
 
+        pending_save = self.coordinator.get_task(f'history:{user_id}')
+        if pending_save:
+            await pending_save
+
         history_dicts = await self.services.get_conversation_history(user_id)
         message_history = convert_to_model_messages(history_dicts)
 
         result = await self.agent.run(user_message, deps=deps, message_history=message_history)
 
-        all_messages = result.all_messages()
-        history_to_save = convert_from_model_messages(all_messages)
-        await self.services.save_conversation_history(user_id, history_to_save, max_messages=10)
+        recent_messages = result.all_messages()[-HISTORY_MAX_MESSAGES:]
+        history_to_save = convert_from_model_messages(recent_messages)
+        self.coordinator.start_task(
+            f'history:{user_id}', self.save_history(user_id, history_to_save)
+        )
 
         return result.output
+
+    async def save_history(self, user_id: str, history: list[dict[str, Any]]) -> None:
+        try:
+            await self.services.save_conversation_history(
+                user_id, history, max_messages=HISTORY_MAX_MESSAGES
+            )
+        except Exception as e:
+            self.logger(f'Failed to save conversation history for user {user_id}: {e}', 'error')
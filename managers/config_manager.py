@@ -1,3 +1,6 @@
+from functools import cached_property
+from urllib.parse import urlparse
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,7 +16,14 @@ class ConfigManager(BaseSettings):
     server_host: str = '0.0.0.0'
     server_port: int = 9000
 
-    model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
+    model_config = SettingsConfigDict(
+        env_file='.env', env_file_encoding='utf-8', extra='ignore', frozen=True
+    )
+
+    @cached_property
+    def redirect_base_url(self) -> str:
+        parsed = urlparse(self.redirect_url)
+        return f'{parsed.scheme}://{parsed.netloc}'
 
 
 config_manager = ConfigManager()
@@ -3,6 +3,7 @@ from typing import NotRequired, TypedDict
 from zoneinfo import ZoneInfo
 
 import httpx
+import orjson
 
 from utils import LogFunction, pick
 
@@ -21,6 +22,9 @@ class CalendarEvent(TypedDict):
     status: str
 
 
+CALENDAR_EVENT_KEYS = ('id', 'summary', 'description', 'start', 'end', 'status')
+
+
 class GoogleCalendarAuthError(Exception):
     pass
 
@@ -44,7 +48,7 @@ class GoogleServicesManager:
         time_max = (now_utc + timedelta(days=7)).isoformat()
 
         self.logger(
-            f'GoogleServicesManager: Fetching events from {time_min} to {time_max}', 'debug'
+            'GoogleServicesManager: Fetching events from %s to %s', 'debug', time_min, time_max
         )
 
         response = await self.http_client.get(
@@ -59,7 +63,7 @@ class GoogleServicesManager:
         )
 
         self.logger(
-            f'GoogleServicesManager: Calendar API response status: {response.status_code}', 'debug'
+            'GoogleServicesManager: Calendar API response status: %s', 'debug', response.status_code
         )
 
         if response.status_code == 401:
@@ -78,7 +82,7 @@ class GoogleServicesManager:
             )
             raise GoogleCalendarAPIError(f'Error fetching events: {response.text}')
 
-        data = response.json()
+        data = orjson.loads(response.content)
         items = data.get('items', [])
         event_count = len(items)
         self.logger(f'GoogleServicesManager: Successfully fetched {event_count} events', 'info')
@@ -86,12 +90,10 @@ class GoogleServicesManager:
         # Log only event IDs and summaries for debugging
         if items:
             event_summaries = [item.get('summary', 'N/A') for item in items[:5]]  # Limit to first 5
-            self.logger(f'GoogleServicesManager: Event summaries: {event_summaries}', 'debug')
+            self.logger('GoogleServicesManager: Event summaries: %s', 'debug', event_summaries)
 
         # Transform raw events to only include essential fields
-        calendar_events: list[CalendarEvent] = [
-            pick(item, ['id', 'summary', 'description', 'start', 'end', 'status']) for item in items
-        ]
+        calendar_events: list[CalendarEvent] = [pick(item, CALENDAR_EVENT_KEYS) for item in items]
 
         return calendar_events
 
@@ -121,12 +123,15 @@ class GoogleServicesManager:
         }
         response = await self.http_client.post(
             self.GOOGLE_CALENDAR_API_BASE,
-            headers={'Authorization': f'Bearer {access_token}'},
-            json=event_body,
+            headers={
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json',
+            },
+            content=orjson.dumps(event_body),
         )
 
         self.logger(
-            f'GoogleServicesManager: Calendar API response status: {response.status_code}', 'debug'
+            'GoogleServicesManager: Calendar API response status: %s', 'debug', response.status_code
         )
 
         if response.status_code not in (200, 201):
@@ -136,14 +141,12 @@ class GoogleServicesManager:
             )
             raise GoogleCalendarAPIError(f'Error creating event: {response.text}')
 
-        result = response.json()
+        result = orjson.loads(response.content)
         self.logger(
             f'GoogleServicesManager: Event created successfully with ID: {result.get("id")}', 'info'
         )
 
         # Transform raw event to only include essential fields
-        calendar_event: CalendarEvent = pick(
-            result, ['id', 'summary', 'description', 'start', 'end', 'status']
-        )
+        calendar_event: CalendarEvent = pick(result, CALENDAR_EVENT_KEYS)
 
         return calendar_event
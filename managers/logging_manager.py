@@ -1,6 +1,7 @@
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import SimpleQueue
 
 
 def create_logger(log_dir: Path, logger_name: str, verbose: bool) -> logging.Logger:
@@ -20,13 +21,28 @@ def create_logger(log_dir: Path, logger_name: str, verbose: bool) -> logging.Log
     )
     handler.setFormatter(formatter)
 
-    logger.addHandler(handler)
+    log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    queue_handler.listener.start()
+
+    logger.addHandler(queue_handler)
     return logger
 
 
+def stop_logger(logger: logging.Logger) -> None:
+    for handler in logger.handlers:
+        if isinstance(handler, QueueHandler) and handler.listener:
+            handler.listener.stop()
+
+
 def create_log_function(logger: logging.Logger):
-    def log_message(message: str, level: str):
-        log_func = getattr(logger, level.lower(), logger.info)
-        log_func(message)
+    levels = ('debug', 'info', 'warning', 'error', 'critical')
+    dispatch = {level: getattr(logger, level) for level in levels}
+    dispatch.update({level.upper(): getattr(logger, level) for level in levels})
+    default = logger.info
+
+    def log_message(message: str, level: str, *args: object):
+        dispatch.get(level, default)(message, *args)
 
     return log_message
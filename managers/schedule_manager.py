@@ -1,30 +1,45 @@
-from typing import Any, Awaitable, Callable
+import asyncio
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from utils import LogFunction
 
 
+@lru_cache(maxsize=1024)
+def compile_cron_trigger(cron: str) -> CronTrigger:
+    return CronTrigger.from_crontab(cron)
+
+
+def parse_cron_trigger(cron: str) -> CronTrigger:
+    return compile_cron_trigger(' '.join(cron.split()))
+
+
 class ScheduleManager:
     def __init__(
         self,
         logger: LogFunction,
-        on_start: Callable[[], Awaitable[list[dict[str, Any]]]] | None = None,
+        on_start: Callable[[], AsyncIterator[list[dict[str, Any]]]] | None = None,
     ):
         self.logger = logger
         self.scheduler = AsyncIOScheduler()
-        self.callback: Callable[[int, str], Awaitable[None]] | None = None
+        self.job_ids: set[str] = set()
+        self.callback: Callable[[str, str, str], Awaitable[None]] | None = None
         self.on_start = on_start
 
-    def set_callback(self, callback: Callable[[str, str], Awaitable[None]]):
+    def set_callback(self, callback: Callable[[str, str, str], Awaitable[None]]):
         self.callback = callback
 
-    async def _job_wrapper(self, user_id: str, message: str, cron: str) -> None:
+    async def _job_wrapper(
+        self, user_id: str, telegram_chat_id: str, message: str, cron: str
+    ) -> None:
         if self.callback:
             try:
                 formatted_message = f"⏰ <b>Periodic Reminder</b>\n\n{message}\n\n🕐 <code>{cron}</code>"
-                await self.callback(user_id, formatted_message)
+                await self.callback(user_id, telegram_chat_id, formatted_message)
             except Exception as e:
                 self.logger(f'Error in reminder callback: {e}', 'error')
         else:
@@ -33,30 +48,48 @@ class ScheduleManager:
                 'warning',
             )
 
-    def schedule_job(self, reminder_id: int, user_id: str, cron: str, message: str) -> None:
+    def schedule_job(
+        self,
+        reminder_id: int,
+        user_id: str,
+        cron: str,
+        message: str,
+        telegram_chat_id: str,
+    ) -> None:
         try:
-            trigger = CronTrigger.from_crontab(cron)
+            trigger = parse_cron_trigger(cron)
             self.scheduler.add_job(
                 self._job_wrapper,
                 trigger=trigger,
-                args=[user_id, message, cron],
+                args=[user_id, telegram_chat_id, message, cron],
                 id=str(reminder_id),
                 replace_existing=True,
             )
+            self.job_ids.add(str(reminder_id))
             self.logger(f'Scheduled job {reminder_id} for user {user_id} with cron {cron}', 'info')
         except ValueError as e:
             self.logger(f'Failed to schedule job {reminder_id}: {e}', 'error')
 
+    def schedule_jobs(self, reminders: list[dict[str, Any]]) -> None:
+        for reminder in reminders:
+            self.schedule_job(
+                reminder['id'],
+                reminder['user_id'],
+                reminder['cron'],
+                reminder['message'],
+                reminder['telegram_chat_id'],
+            )
+
     async def start(self):
         # Load reminders from callback and schedule them
         if self.on_start:
             try:
-                reminders = await self.on_start()
-                self.logger(f'Loading {len(reminders)} reminders from callback...', 'info')
-                for reminder in reminders:
-                    self.schedule_job(
-                        reminder['id'], reminder['user_id'], reminder['cron'], reminder['message']
-                    )
+                self.logger('Loading reminders from callback...', 'info')
+                reminder_count = 0
+                async for reminders in self.on_start():
+                    await asyncio.to_thread(self.schedule_jobs, reminders)
+                    reminder_count += len(reminders)
+                self.logger(f'Loaded {reminder_count} reminders', 'info')
             except Exception as e:
                 self.logger(f'Error loading initial reminders: {e}', 'error')
 
@@ -64,21 +97,33 @@ class ScheduleManager:
             self.scheduler.start()
             self.logger('Scheduler started.', 'info')
 
-    async def add_reminder(self, reminder_id: int, user_id: str, cron: str, message: str) -> None:
+    async def add_reminder(
+        self,
+        reminder_id: int,
+        user_id: str,
+        cron: str,
+        message: str,
+        telegram_chat_id: str,
+    ) -> None:
         # Validate cron first
         try:
-            CronTrigger.from_crontab(cron)
+            parse_cron_trigger(cron)
         except ValueError as e:
             raise ValueError(f'Invalid cron expression: {e}') from e
 
-        self.schedule_job(reminder_id, user_id, cron, message)
+        self.schedule_job(reminder_id, user_id, cron, message, telegram_chat_id)
 
     async def delete_reminder(self, reminder_id: int) -> bool:
         job_id = str(reminder_id)
-        if self.scheduler.get_job(job_id):
+        if job_id not in self.job_ids:
+            return False
+
+        self.job_ids.discard(job_id)
+        try:
             self.scheduler.remove_job(job_id)
-            return True
-        return False
+        except JobLookupError:
+            return False
+        return True
 
     async def stop(self):
         if self.scheduler.running:
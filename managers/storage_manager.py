@@ -1,9 +1,55 @@
-from typing import Any
-
-from sqlalchemy import JSON, Integer, String, select
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from contextlib import asynccontextmanager
+from time import time
+from typing import Any, AsyncIterator
+
+import orjson
+from sqlalchemy import (
+    JSON,
+    Integer,
+    String,
+    bindparam,
+    delete,
+    event,
+    func,
+    inspect,
+    lambda_stmt,
+    make_url,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from utils import LRUCache, TTLCache
+
+TOKEN_CACHE_MAX_TTL = 3300
+TOKEN_REFRESH_MARGIN = 300
+TOKEN_CACHE_SIZE = 10_000
+USER_MAPPING_CACHE_SIZE = 10_000
+UNAUTHENTICATED_CACHE_SIZE = 10_000
+UNAUTHENTICATED_CACHE_TTL = 30
+REMINDER_BATCH_SIZE = 500
+
+UPSERT_INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+ENGINE_POOL_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+    'pool_recycle': 3600,
+}
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-64000',
+)
+
 
 def rotate_messages(messages: list[dict[str, Any]], max_messages: int) -> list[dict[str, Any]]:
     if max_messages <= 0:
@@ -15,6 +61,47 @@ def rotate_messages(messages: list[dict[str, Any]], max_messages: int) -> list[d
     return messages[-max_messages:]
 
 
+def token_cache_ttl(token_data: dict[str, Any], now: float) -> float:
+    expires_at = token_data.get('expires_at')
+    if not expires_at:
+        return TOKEN_CACHE_MAX_TTL
+    return min(expires_at - now - TOKEN_REFRESH_MARGIN, TOKEN_CACHE_MAX_TTL)
+
+
+def get_upsert_insert(dialect_name: str):
+    if dialect_name not in UPSERT_INSERTS:
+        raise ValueError(f'Unsupported database dialect: {dialect_name}')
+    return UPSERT_INSERTS[dialect_name]
+
+
+def serialize_json(value: Any) -> str:
+    return orjson.dumps(value).decode()
+
+
+def get_async_db_url(db_url: str) -> str:
+    url = make_url(db_url)
+    backend_name = url.get_backend_name()
+    if backend_name not in ASYNC_DRIVERS:
+        raise ValueError(f'Unsupported database backend: {backend_name}')
+    if url.drivername == backend_name:
+        return url.set(drivername=ASYNC_DRIVERS[backend_name]).render_as_string(hide_password=False)
+    return db_url
+
+
+def get_engine_options(db_url: str) -> dict[str, Any]:
+    url = make_url(db_url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return ENGINE_POOL_OPTIONS
+
+
+def apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -30,19 +117,17 @@ class Reminder(Base):
     __tablename__ = 'reminders'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[str] = mapped_column(String)
+    user_id: Mapped[str] = mapped_column(String, index=True)
     cron: Mapped[str] = mapped_column(String)
     message: Mapped[str] = mapped_column(String)
-
-    def to_dict(self) -> dict[str, Any]:
-        return {'id': self.id, 'user_id': self.user_id, 'cron': self.cron, 'message': self.message}
+    telegram_chat_id: Mapped[str] = mapped_column(String)
 
 
 class TelegramUserMapping(Base):
     __tablename__ = 'telegram_user_mappings'
 
     telegram_id: Mapped[str] = mapped_column(String, primary_key=True)
-    google_sub: Mapped[str] = mapped_column(String)
+    google_sub: Mapped[str] = mapped_column(String, index=True)
 
 
 class ConversationHistory(Base):
@@ -52,134 +137,296 @@ class ConversationHistory(Base):
     messages: Mapped[list[dict[str, Any]]] = mapped_column(JSON)
 
 
+REMINDER_COLUMNS = (
+    Reminder.id,
+    Reminder.user_id,
+    Reminder.cron,
+    Reminder.message,
+    Reminder.telegram_chat_id,
+)
+
+ADD_REMINDER_CHAT_ID_COLUMN = text('ALTER TABLE reminders ADD COLUMN telegram_chat_id VARCHAR')
+BACKFILL_REMINDER_CHAT_IDS = (
+    update(Reminder)
+    .where(Reminder.telegram_chat_id.is_(None))
+    .values(
+        telegram_chat_id=func.coalesce(
+            select(TelegramUserMapping.telegram_id)
+            .where(TelegramUserMapping.google_sub == Reminder.user_id)
+            .limit(1)
+            .scalar_subquery(),
+            select(TelegramUserMapping.telegram_id)
+            .where(TelegramUserMapping.telegram_id == Reminder.user_id)
+            .scalar_subquery(),
+        )
+    )
+)
+SELECT_UNRESOLVED_REMINDER_IDS = select(Reminder.id).where(Reminder.telegram_chat_id.is_(None))
+
+SELECT_TOKEN_DATA = lambda_stmt(
+    lambda: select(UserToken.token_data).where(UserToken.user_id == bindparam('user_id'))
+)
+SELECT_ACCESS_TOKEN = lambda_stmt(
+    lambda: select(UserToken.token_data['access_token'].as_string()).where(
+        UserToken.user_id == bindparam('user_id')
+    )
+)
+SELECT_USER_REMINDERS = lambda_stmt(
+    lambda: select(*REMINDER_COLUMNS).where(Reminder.user_id == bindparam('user_id'))
+)
+SELECT_CONVERSATION_MESSAGES = lambda_stmt(
+    lambda: select(ConversationHistory.messages).where(
+        ConversationHistory.user_id == bindparam('user_id')
+    )
+)
+SELECT_GOOGLE_SUB = lambda_stmt(
+    lambda: select(TelegramUserMapping.google_sub).where(
+        TelegramUserMapping.telegram_id == bindparam('telegram_id')
+    )
+)
+SELECT_GOOGLE_SUB_AND_TOKEN = lambda_stmt(
+    lambda: (
+        select(TelegramUserMapping.google_sub, UserToken.token_data)
+        .outerjoin(UserToken, UserToken.user_id == TelegramUserMapping.google_sub)
+        .where(TelegramUserMapping.telegram_id == bindparam('telegram_id'))
+    )
+)
+SELECT_TELEGRAM_ID = lambda_stmt(
+    lambda: select(TelegramUserMapping.telegram_id).where(
+        TelegramUserMapping.google_sub == bindparam('google_sub')
+    )
+)
+
+
+def add_reminder_chat_id_column(connection) -> bool:
+    columns = {column['name'] for column in inspect(connection).get_columns('reminders')}
+    if 'telegram_chat_id' in columns:
+        return False
+
+    connection.execute(ADD_REMINDER_CHAT_ID_COLUMN)
+    return True
+
+
+def create_missing_indexes(connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 class StorageManager:
     def __init__(self, db_url: str):
-        self.engine = create_async_engine(db_url)
+        db_url = get_async_db_url(db_url)
+        self.engine = create_async_engine(
+            db_url,
+            json_serializer=serialize_json,
+            json_deserializer=orjson.loads,
+            **get_engine_options(db_url),
+        )
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, 'connect', apply_sqlite_pragmas)
         self.async_session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.insert = get_upsert_insert(self.engine.dialect.name)
+        self.token_cache: TTLCache[dict[str, Any]] = TTLCache(TOKEN_CACHE_SIZE)
+        self.google_sub_cache: LRUCache[str] = LRUCache(USER_MAPPING_CACHE_SIZE)
+        self.telegram_id_cache: LRUCache[str] = LRUCache(USER_MAPPING_CACHE_SIZE)
+        self.unauthenticated_users: TTLCache[bool] = TTLCache(UNAUTHENTICATED_CACHE_SIZE)
 
-    async def init_db(self):
+    async def init_db(self) -> list[int]:
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(create_missing_indexes)
+            if not await conn.run_sync(add_reminder_chat_id_column):
+                return []
 
-    async def save_user_token(self, user_id: str, token_data: dict[str, Any]):
+            await conn.execute(BACKFILL_REMINDER_CHAT_IDS)
+            result = await conn.execute(SELECT_UNRESOLVED_REMINDER_IDS)
+            return list(result.scalars())
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
         async with self.async_session() as session:
-            result = await session.execute(select(UserToken).where(UserToken.user_id == user_id))
-            user_token = result.scalar_one_or_none()
+            yield session
+            await session.commit()
 
-            if user_token:
-                user_token.token_data = token_data
-            else:
-                user_token = UserToken(user_id=user_id, token_data=token_data)
-                session.add(user_token)
+    async def upsert(self, model: type[Base], key: str, values: dict[str, Any]):
+        stmt = self.insert(model).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={name: stmt.excluded[name] for name in values if name != key},
+        )
+        async with self.transaction() as session:
+            await session.execute(stmt)
 
-            await session.commit()
+    async def save_user_token(self, user_id: str, token_data: dict[str, Any]):
+        self.token_cache.invalidate(user_id)
+        await self.upsert(UserToken, 'user_id', {'user_id': user_id, 'token_data': token_data})
+
+        self.token_cache.set(user_id, dict(token_data), token_cache_ttl(token_data, time()))
+        telegram_id = self.telegram_id_cache.get(user_id)
+        if telegram_id:
+            self.unauthenticated_users.invalidate(telegram_id)
 
     async def get_user_token(self, user_id: str) -> dict[str, Any] | None:
-        async with self.async_session() as session:
-            result = await session.execute(select(UserToken).where(UserToken.user_id == user_id))
-            user_token = result.scalar_one_or_none()
-            return user_token.token_data if user_token else None
+        cached_token = self.token_cache.get(user_id)
+        if cached_token is not None:
+            return dict(cached_token)
+
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_TOKEN_DATA, {'user_id': user_id})
+            token_data = result.scalar_one_or_none()
+
+        if not token_data:
+            return None
+
+        self.token_cache.set(user_id, dict(token_data), token_cache_ttl(token_data, time()))
+        return token_data
+
+    async def get_access_token(self, user_id: str) -> str | None:
+        cached_token = self.token_cache.get(user_id)
+        if cached_token is not None:
+            return cached_token.get('access_token')
+
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_ACCESS_TOKEN, {'user_id': user_id})
+            return result.scalar_one_or_none()
+
+    def invalidate_user_token(self, user_id: str) -> None:
+        self.token_cache.invalidate(user_id)
 
     async def delete_user_token(self, user_id: str) -> bool:
-        async with self.async_session() as session:
-            result = await session.execute(select(UserToken).where(UserToken.user_id == user_id))
-            user_token = result.scalar_one_or_none()
-            if user_token:
-                await session.delete(user_token)
-                await session.commit()
-                return True
-            return False
-
-    async def add_reminder(self, user_id: str, cron: str, message: str) -> int:
-        async with self.async_session() as session:
-            reminder = Reminder(user_id=user_id, cron=cron, message=message)
+        self.token_cache.invalidate(user_id)
+        async with self.transaction() as session:
+            result = await session.execute(
+                delete(UserToken).where(UserToken.user_id == user_id).returning(UserToken.user_id)
+            )
+            return result.first() is not None
+
+    async def add_reminder(
+        self, user_id: str, cron: str, message: str, telegram_chat_id: str
+    ) -> int:
+        async with self.transaction() as session:
+            reminder = Reminder(
+                user_id=user_id, cron=cron, message=message, telegram_chat_id=telegram_chat_id
+            )
             session.add(reminder)
-            await session.commit()
-            await session.refresh(reminder)
+            await session.flush()
             return reminder.id
 
     async def get_reminders(self, user_id: str) -> list[dict[str, Any]]:
-        async with self.async_session() as session:
-            result = await session.execute(select(Reminder).where(Reminder.user_id == user_id))
-            reminders = result.scalars().all()
-            return [r.to_dict() for r in reminders]
-
-    async def get_all_reminders(self) -> list[dict[str, Any]]:
-        async with self.async_session() as session:
-            result = await session.execute(select(Reminder))
-            reminders = result.scalars().all()
-            return [r.to_dict() for r in reminders]
-
-    async def delete_reminder(self, reminder_id: int) -> bool:
-        async with self.async_session() as session:
-            result = await session.execute(select(Reminder).where(Reminder.id == reminder_id))
-            reminder = result.scalar_one_or_none()
-            if reminder:
-                await session.delete(reminder)
-                await session.commit()
-                return True
-            return False
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_USER_REMINDERS, {'user_id': user_id})
+            return [dict(row) for row in result.mappings()]
+
+    async def stream_all_reminders(self) -> AsyncIterator[list[dict[str, Any]]]:
+        async with self.transaction() as session:
+            result = await session.stream(
+                select(*REMINDER_COLUMNS)
+                .where(Reminder.telegram_chat_id.is_not(None))
+                .execution_options(yield_per=REMINDER_BATCH_SIZE)
+            )
+            async for rows in result.mappings().partitions():
+                yield [dict(row) for row in rows]
 
-    async def get_conversation_history(self, user_id: str) -> list[dict[str, Any]]:
-        async with self.async_session() as session:
+    async def delete_reminder(self, reminder_id: int, telegram_chat_id: str) -> bool:
+        async with self.transaction() as session:
             result = await session.execute(
-                select(ConversationHistory).where(ConversationHistory.user_id == user_id)
+                delete(Reminder)
+                .where(Reminder.id == reminder_id, Reminder.telegram_chat_id == telegram_chat_id)
+                .returning(Reminder.id)
             )
-            history = result.scalar_one_or_none()
-            return history.messages if history else []
+            return result.first() is not None
+
+    async def get_conversation_history(self, user_id: str) -> list[dict[str, Any]]:
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_CONVERSATION_MESSAGES, {'user_id': user_id})
+            messages = result.scalar_one_or_none()
+            return messages if messages else []
 
     async def save_conversation_history(
         self, user_id: str, messages: list[dict[str, Any]], max_messages: int
     ):
-        if max_messages <= 0:
-            raise ValueError('max_messages must be positive')
-
         rotated_messages = rotate_messages(messages, max_messages)
 
-        async with self.async_session() as session:
-            result = await session.execute(
-                select(ConversationHistory).where(ConversationHistory.user_id == user_id)
-            )
-            history = result.scalar_one_or_none()
-
-            if history:
-                history.messages = rotated_messages
-            else:
-                history = ConversationHistory(user_id=user_id, messages=rotated_messages)
-                session.add(history)
-
-            await session.commit()
+        await self.upsert(
+            ConversationHistory, 'user_id', {'user_id': user_id, 'messages': rotated_messages}
+        )
 
     async def save_telegram_user_mapping(self, telegram_id: str, google_sub: str):
-        async with self.async_session() as session:
+        await self.upsert(
+            TelegramUserMapping,
+            'telegram_id',
+            {'telegram_id': telegram_id, 'google_sub': google_sub},
+        )
+        self.unauthenticated_users.invalidate(telegram_id)
+
+        previous_google_sub = self.google_sub_cache.get(telegram_id)
+        if previous_google_sub:
+            self.telegram_id_cache.invalidate(previous_google_sub)
+        self.cache_user_mapping(telegram_id, google_sub)
+
+    def cache_user_mapping(self, telegram_id: str, google_sub: str) -> None:
+        self.google_sub_cache.set(telegram_id, google_sub)
+        self.telegram_id_cache.set(google_sub, telegram_id)
+
+    async def get_google_sub_for_telegram_id(self, telegram_id: str) -> str | None:
+        cached_google_sub = self.google_sub_cache.get(telegram_id)
+        if cached_google_sub is not None:
+            return cached_google_sub
+
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_GOOGLE_SUB, {'telegram_id': telegram_id})
+            google_sub = result.scalar_one_or_none()
+
+        if google_sub:
+            self.cache_user_mapping(telegram_id, google_sub)
+        return google_sub
+
+    async def get_google_sub_and_token(
+        self, telegram_id: str
+    ) -> tuple[str | None, dict[str, Any] | None]:
+        if self.unauthenticated_users.get(telegram_id):
+            return None, None
+
+        cached_google_sub = self.google_sub_cache.get(telegram_id)
+        if cached_google_sub is not None:
+            token_data = await self.get_user_token(cached_google_sub)
+            if not token_data:
+                self.mark_unauthenticated(telegram_id)
+            return cached_google_sub, token_data
+
+        async with self.transaction() as session:
             result = await session.execute(
-                select(TelegramUserMapping).where(TelegramUserMapping.telegram_id == telegram_id)
+                SELECT_GOOGLE_SUB_AND_TOKEN, {'telegram_id': telegram_id}
             )
-            mapping = result.scalar_one_or_none()
+            row = result.first()
 
-            if mapping:
-                mapping.google_sub = google_sub
-            else:
-                mapping = TelegramUserMapping(telegram_id=telegram_id, google_sub=google_sub)
-                session.add(mapping)
+        if row is None:
+            self.mark_unauthenticated(telegram_id)
+            return None, None
 
-            await session.commit()
+        google_sub, token_data = row
+        self.cache_user_mapping(telegram_id, google_sub)
+        if token_data:
+            self.token_cache.set(google_sub, dict(token_data), token_cache_ttl(token_data, time()))
+        else:
+            self.mark_unauthenticated(telegram_id)
+        return google_sub, token_data
 
-    async def get_google_sub_for_telegram_id(self, telegram_id: str) -> str | None:
-        async with self.async_session() as session:
-            result = await session.execute(
-                select(TelegramUserMapping).where(TelegramUserMapping.telegram_id == telegram_id)
-            )
-            mapping = result.scalar_one_or_none()
-            return mapping.google_sub if mapping else None
+    def mark_unauthenticated(self, telegram_id: str) -> None:
+        self.unauthenticated_users.set(telegram_id, True, UNAUTHENTICATED_CACHE_TTL)
 
     async def get_telegram_id_for_google_sub(self, google_sub: str) -> str | None:
-        async with self.async_session() as session:
-            result = await session.execute(
-                select(TelegramUserMapping).where(TelegramUserMapping.google_sub == google_sub)
-            )
-            mapping = result.scalar_one_or_none()
-            return mapping.telegram_id if mapping else None
+        cached_telegram_id = self.telegram_id_cache.get(google_sub)
+        if cached_telegram_id is not None:
+            return cached_telegram_id
+
+        async with self.transaction() as session:
+            result = await session.execute(SELECT_TELEGRAM_ID, {'google_sub': google_sub})
+            telegram_id = result.scalar_one_or_none()
+
+        if telegram_id:
+            self.cache_user_mapping(telegram_id, google_sub)
+        return telegram_id
 
     async def close(self):
         await self.engine.dispose()
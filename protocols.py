@@ -4,7 +4,7 @@ from zoneinfo import ZoneInfo
 
 
 class AgentServices(Protocol):
-    async def add_reminder(self, user_id: str, cron: str, message: str) -> int: ...
+    async def add_reminder(self, user_id: str, cron: str, message: str) -> int | str: ...
 
     async def create_calendar_event(
         self,
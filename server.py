@@ -5,10 +5,10 @@ from starlette.applications import Starlette
 import uvicorn
 
 from managers.adapters import AiAgentAdapter
-from managers.agent_manager import AgentManager
+from managers.agent_manager import AGENT_CONCURRENCY, AgentManager, create_google_model
 from managers.config_manager import config_manager
 from managers.google_services_manager import GoogleServicesManager
-from managers.logging_manager import create_log_function, create_logger
+from managers.logging_manager import create_log_function, create_logger, stop_logger
 from managers.schedule_manager import ScheduleManager
 from managers.storage_manager import StorageManager
 from ui.telegram import (
@@ -18,7 +18,8 @@ from ui.telegram import (
     stop_telegram_bot,
 )
 from ui.web import create_app
-from utils import create_http_client
+from utils.http_client import create_http_client
+from utils.tasks import TaskCoordinator
 
 
 @asynccontextmanager
@@ -29,15 +30,24 @@ async def combined_lifespan(app: Starlette):
     bot_application = app.state.bot_application
     google_services_manager = app.state.google_services_manager
     logger = app.state.logger
+    coordinator = TaskCoordinator(AGENT_CONCURRENCY)
 
-    await storage_manager.init_db()
+    unresolved_reminder_ids = await storage_manager.init_db()
+    if unresolved_reminder_ids:
+        logger(
+            'Reminders without a linked Telegram chat will not be scheduled: %s',
+            'warning',
+            unresolved_reminder_ids,
+        )
+
+    agent_model = create_google_model(config_manager.google_api_key)
 
     # Initialize agent manager for web interface
     web_agent_adapter = AiAgentAdapter(
         storage_manager, schedule_manager, google_services_manager, logger
     )
     app.state.agent_manager = AgentManager(
-        config_manager.google_api_key, services=web_agent_adapter, logger=logger
+        agent_model, services=web_agent_adapter, logger=logger, coordinator=coordinator
     )
     logger('Agent manager initialized', 'info')
 
@@ -47,16 +57,19 @@ async def combined_lifespan(app: Starlette):
         schedule_manager,
         google_services_manager,
         logger,
-        config_manager.google_api_key,
+        agent_model,
+        coordinator,
     )
 
     try:
         yield
     finally:
         await stop_telegram_bot(bot_application, schedule_manager, logger)
+        await coordinator.shutdown()
         logger('Closing resources', 'info')
         await storage_manager.close()
         await http_client.aclose()
+        stop_logger(app.state.logger_instance)
 
 
 def build_app(verbose: bool):
@@ -66,13 +79,14 @@ def build_app(verbose: bool):
 
     http_client = create_http_client(log_message)
     storage_manager = StorageManager(config_manager.database_url)
-    schedule_manager = ScheduleManager(log_message, storage_manager.get_all_reminders)
+    schedule_manager = ScheduleManager(log_message, storage_manager.stream_all_reminders)
     google_services_manager = GoogleServicesManager(http_client, log_message)
 
     bot_application = create_bot_application()
     bot_application.bot_data['storage_manager'] = storage_manager
     bot_application.bot_data['schedule_manager'] = schedule_manager
     bot_application.bot_data['google_services_manager'] = google_services_manager
+    bot_application.bot_data['http_client'] = http_client
     bot_application.bot_data['logger'] = log_message
 
     register_handlers(bot_application)
@@ -87,6 +101,7 @@ def build_app(verbose: bool):
     )
 
     web_app.state.google_services_manager = google_services_manager
+    web_app.state.logger_instance = logger_instance
     web_app.router.lifespan_context = combined_lifespan
 
     return web_app
@@ -98,6 +113,8 @@ def start():
         app,
         host=config_manager.server_host,
         port=config_manager.server_port,
+        loop='uvloop',
+        http='httptools',
         proxy_headers=True,
         forwarded_allow_ips='*',
     )
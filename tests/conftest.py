@@ -0,0 +1,13 @@
+import os
+
+for name, value in {
+    'GOOGLE_OAUTH2_CLIENT_ID': 'test-client-id',
+    'GOOGLE_OAUTH2_SECRET': 'test-secret',
+    'REDIRECT_URL': 'http://localhost:9000/auth',
+    'SECRET_KEY': 'test-secret-key',
+    'TELEGRAM_BOT_TOKEN': 'test-token',
+    'GOOGLE_API_KEY': 'test-api-key',
+    'DATABASE_URL': 'sqlite+aiosqlite:///:memory:',
+    'DEBUG': 'false',
+}.items():
+    os.environ.setdefault(name, value)
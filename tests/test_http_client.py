@@ -0,0 +1,56 @@
+import httpx
+import pytest
+
+from utils import NOOP_LOG
+from utils.http_client import RetryTransport
+
+
+class TrackedStream(httpx.AsyncByteStream):
+    def __init__(self, content: bytes):
+        self.content = content
+        self.read = False
+        self.closed = False
+
+    async def __aiter__(self):
+        self.read = True
+        yield self.content
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    queue: list[tuple[int, TrackedStream]] = []
+
+    async def handle_async_request(_transport, _request):
+        status_code, stream = queue.pop(0)
+        return httpx.Response(status_code, stream=stream)
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, 'handle_async_request', handle_async_request)
+    return queue
+
+
+async def test_response_stream_is_returned_unread(responses):
+    stream = TrackedStream(b'body')
+    responses.append((200, stream))
+
+    transport = RetryTransport(3, NOOP_LOG, retry_budget=25.0)
+    response = await transport.handle_async_request(httpx.Request('GET', 'https://example.com'))
+
+    assert response.stream is stream
+    assert stream.read is False
+    assert stream.closed is False
+
+
+async def test_discarded_retry_response_is_closed(responses):
+    failed, succeeded = TrackedStream(b'error'), TrackedStream(b'body')
+    responses.extend([(503, failed), (200, succeeded)])
+
+    transport = RetryTransport(3, NOOP_LOG, retry_budget=25.0)
+    transport.backoff_windows = (0.0, 0.0, 0.0)
+    response = await transport.handle_async_request(httpx.Request('GET', 'https://example.com'))
+
+    assert failed.closed is True
+    assert response.stream is succeeded
+    assert succeeded.closed is False
@@ -1,14 +1,16 @@
 from unittest.mock import AsyncMock, MagicMock
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.triggers.cron import CronTrigger
 import pytest
 
-from managers.schedule_manager import ScheduleManager
+from managers.schedule_manager import ScheduleManager, parse_cron_trigger
+from utils import NOOP_LOG
 
 
 @pytest.fixture
 def schedule_manager():
-    manager = ScheduleManager()
+    manager = ScheduleManager(NOOP_LOG)
     # Mock the internal scheduler to avoid actual job scheduling logic dependencies
     manager.scheduler = MagicMock()
     return manager
@@ -21,7 +23,7 @@ async def test_add_reminder_valid(schedule_manager):
     cron = '* * * * *'
     message = 'hello'
 
-    await schedule_manager.add_reminder(reminder_id, user_id, cron, message)
+    await schedule_manager.add_reminder(reminder_id, user_id, cron, message, str(user_id))
 
     # Verify scheduler.add_job was called correctly
     schedule_manager.scheduler.add_job.assert_called_once()
@@ -30,10 +32,17 @@ async def test_add_reminder_valid(schedule_manager):
 
     assert kwargs['id'] == str(reminder_id)
     assert isinstance(kwargs['trigger'], CronTrigger)
-    assert kwargs['args'] == [user_id, message]
+    assert kwargs['args'] == [user_id, str(user_id), message, cron]
     assert kwargs['replace_existing'] is True
 
 
+def test_parse_cron_trigger_is_cached():
+    trigger = parse_cron_trigger('0 9 * * *')
+    assert isinstance(trigger, CronTrigger)
+    assert parse_cron_trigger('0 9 * * *') is trigger
+    assert parse_cron_trigger(' 0  9 * * * ') is trigger
+
+
 @pytest.mark.asyncio
 async def test_add_reminder_invalid_cron(schedule_manager):
     reminder_id = 1
@@ -42,58 +51,96 @@ async def test_add_reminder_invalid_cron(schedule_manager):
     message = 'hello'
 
     with pytest.raises(ValueError, match='Invalid cron expression'):
-        await schedule_manager.add_reminder(reminder_id, user_id, cron, message)
+        await schedule_manager.add_reminder(reminder_id, user_id, cron, message, str(user_id))
 
 
 @pytest.mark.asyncio
 async def test_delete_reminder(schedule_manager):
     reminder_id = 1
-
-    # Setup mock to simulate job existing
-    schedule_manager.scheduler.get_job.return_value = True
+    await schedule_manager.add_reminder(reminder_id, '123', '* * * * *', 'hello', '123')
 
     result = await schedule_manager.delete_reminder(reminder_id)
     assert result is True
     schedule_manager.scheduler.remove_job.assert_called_with(str(reminder_id))
 
-    # Setup mock to simulate job not existing
-    schedule_manager.scheduler.get_job.return_value = None
+    # Deleting again finds no scheduled job
+    result = await schedule_manager.delete_reminder(reminder_id)
+    assert result is False
+    schedule_manager.scheduler.remove_job.assert_called_once()
+
+    # Job that was never scheduled
     result = await schedule_manager.delete_reminder(2)
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_delete_reminder_removed_outside_the_manager(schedule_manager):
+    await schedule_manager.add_reminder(1, '123', '* * * * *', 'hello', '123')
+    schedule_manager.scheduler.remove_job.side_effect = JobLookupError('1')
+
+    assert await schedule_manager.delete_reminder(1) is False
+    assert await schedule_manager.delete_reminder(1) is False
+    schedule_manager.scheduler.remove_job.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_callback_execution():
-    manager = ScheduleManager()
+    manager = ScheduleManager(NOOP_LOG)
     callback = AsyncMock()
     manager.set_callback(callback)
 
     user_id = 123
     message = 'test message'
+    cron = '* * * * *'
 
-    await manager._job_wrapper(user_id, message)
-    callback.assert_awaited_with(user_id, message)
+    await manager._job_wrapper(user_id, '456', message, cron)
+    callback.assert_awaited_once()
+    called_user_id, called_chat_id, formatted_message = callback.await_args.args
+    assert called_user_id == user_id
+    assert called_chat_id == '456'
+    assert message in formatted_message
+    assert cron in formatted_message
 
     # Test error handling in callback (should not raise exception)
     callback.side_effect = Exception('Callback Error')
-    await manager._job_wrapper(user_id, message)
+    await manager._job_wrapper(user_id, '456', message, cron)
+
+
+async def stream_initial_reminders():
+    yield [
+        {
+            'id': 1,
+            'user_id': 101,
+            'cron': '* * * * *',
+            'message': 'msg1',
+            'telegram_chat_id': '101',
+        },
+        {
+            'id': 2,
+            'user_id': 102,
+            'cron': '0 12 * * *',
+            'message': 'msg2',
+            'telegram_chat_id': '102',
+        },
+    ]
+    yield [
+        {
+            'id': 3,
+            'user_id': 103,
+            'cron': '0 18 * * *',
+            'message': 'msg3',
+            'telegram_chat_id': '103',
+        }
+    ]
 
 
 @pytest.mark.asyncio
 async def test_start_loads_reminders():
-    # Mock on_start callback
-    initial_reminders = [
-        {'id': 1, 'user_id': 101, 'cron': '* * * * *', 'message': 'msg1'},
-        {'id': 2, 'user_id': 102, 'cron': '0 12 * * *', 'message': 'msg2'},
-    ]
-    on_start = AsyncMock(return_value=initial_reminders)
-
-    manager = ScheduleManager(on_start=on_start)
+    manager = ScheduleManager(NOOP_LOG, on_start=stream_initial_reminders)
     manager.scheduler = MagicMock()
     manager.scheduler.running = False
 
     await manager.start()
 
-    on_start.assert_awaited_once()
-    assert manager.scheduler.add_job.call_count == 2
+    assert manager.scheduler.add_job.call_count == 3
     manager.scheduler.start.assert_called_once()
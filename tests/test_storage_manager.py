@@ -1,6 +1,16 @@
+import sqlite3
+
 import pytest
 
-from managers.storage_manager import StorageManager, rotate_messages
+from managers.storage_manager import (
+    TOKEN_CACHE_MAX_TTL,
+    TOKEN_REFRESH_MARGIN,
+    StorageManager,
+    get_async_db_url,
+    get_engine_options,
+    rotate_messages,
+    token_cache_ttl,
+)
 
 
 @pytest.fixture
@@ -80,7 +90,7 @@ async def test_reminder_flow(storage_manager):
     message = 'Test Reminder'
 
     # Test adding reminder
-    reminder_id = await storage_manager.add_reminder(user_id, cron, message)
+    reminder_id = await storage_manager.add_reminder(user_id, cron, message, user_id)
     assert isinstance(reminder_id, int)
 
     # Test getting reminders for user
@@ -90,24 +100,65 @@ async def test_reminder_flow(storage_manager):
     assert reminders[0]['user_id'] == user_id
     assert reminders[0]['cron'] == cron
     assert reminders[0]['message'] == message
+    assert reminders[0]['telegram_chat_id'] == user_id
 
     # Test getting all reminders
-    all_reminders = await storage_manager.get_all_reminders()
-    assert len(all_reminders) == 1
+    batches = [batch async for batch in storage_manager.stream_all_reminders()]
+    assert len(batches) == 1
+    assert len(batches[0]) == 1
+
+    # Test deleting another user's reminder
+    deleted = await storage_manager.delete_reminder(reminder_id, '654321')
+    assert deleted is False
 
     # Test deleting reminder
-    deleted = await storage_manager.delete_reminder(reminder_id)
+    deleted = await storage_manager.delete_reminder(reminder_id, user_id)
     assert deleted is True
 
     reminders = await storage_manager.get_reminders(user_id)
     assert len(reminders) == 0
 
     # Test deleting non-existent reminder
-    deleted = await storage_manager.delete_reminder(999)
+    deleted = await storage_manager.delete_reminder(999, user_id)
     assert deleted is False
 
 
+async def test_delete_agent_reminder_by_telegram_chat(storage_manager):
+    reminder_id = await storage_manager.add_reminder('google-sub', '0 9 * * *', 'morning', '111')
+
+    assert await storage_manager.delete_reminder(reminder_id, '222') is False
+    assert await storage_manager.delete_reminder(reminder_id, '111') is True
+    assert await storage_manager.get_reminders('google-sub') == []
+
+
 @pytest.mark.asyncio
+async def test_init_db_backfills_reminder_chat_ids_through_mappings(tmp_path):
+    db_path = tmp_path / 'legacy.db'
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(
+            """
+            CREATE TABLE reminders (
+                id INTEGER PRIMARY KEY, user_id VARCHAR, cron VARCHAR, message VARCHAR
+            );
+            CREATE TABLE telegram_user_mappings (
+                telegram_id VARCHAR PRIMARY KEY, google_sub VARCHAR
+            );
+            INSERT INTO telegram_user_mappings VALUES ('111', 'sub-a');
+            INSERT INTO reminders VALUES (1, 'sub-a', '0 9 * * *', 'by google sub');
+            INSERT INTO reminders VALUES (2, '111', '0 9 * * *', 'by telegram id');
+            INSERT INTO reminders VALUES (3, '222', '0 9 * * *', 'unlinked');
+            """
+        )
+
+    manager = StorageManager(f'sqlite+aiosqlite:///{db_path}')
+    assert await manager.init_db() == [3]
+    assert await manager.init_db() == []
+
+    reminders = [r async for batch in manager.stream_all_reminders() for r in batch]
+    assert [(r['id'], r['telegram_chat_id']) for r in reminders] == [(1, '111'), (2, '111')]
+    await manager.close()
+
+
 async def test_conversation_history_rotation(storage_manager):
     user_id = '12345'
 
@@ -149,3 +200,118 @@ async def test_conversation_history_empty(storage_manager):
     user_id = '99999'
     history = await storage_manager.get_conversation_history(user_id)
     assert history == []
+
+
+def test_engine_options_skip_pool_for_in_memory_sqlite():
+    assert get_engine_options('sqlite+aiosqlite:///:memory:') == {}
+    assert get_engine_options('sqlite+aiosqlite:///data.db')['pool_size'] == 10
+
+
+def test_async_db_url_uses_aiosqlite_for_bare_sqlite():
+    assert get_async_db_url('sqlite:///data.db') == 'sqlite+aiosqlite:///data.db'
+    assert get_async_db_url('sqlite+aiosqlite:///data.db') == 'sqlite+aiosqlite:///data.db'
+
+
+def test_async_db_url_uses_asyncpg_for_bare_postgresql():
+    assert get_async_db_url('postgresql://u:p@db/app') == 'postgresql+asyncpg://u:p@db/app'
+    assert get_async_db_url('postgresql+asyncpg://u@db/app') == 'postgresql+asyncpg://u@db/app'
+
+
+def test_async_db_url_rejects_unsupported_backends():
+    with pytest.raises(ValueError, match='Unsupported database backend: mysql'):
+        get_async_db_url('mysql://u@db/app')
+
+
+def test_token_cache_ttl_without_expiry():
+    assert token_cache_ttl({'access_token': 'abc'}, now=1000) == TOKEN_CACHE_MAX_TTL
+
+
+def test_token_cache_ttl_stops_before_refresh_window():
+    token_data = {'access_token': 'abc', 'expires_at': 2000}
+    assert token_cache_ttl(token_data, now=1000) == 2000 - 1000 - TOKEN_REFRESH_MARGIN
+
+
+def test_token_cache_ttl_is_capped():
+    token_data = {'access_token': 'abc', 'expires_at': 100_000}
+    assert token_cache_ttl(token_data, now=1000) == TOKEN_CACHE_MAX_TTL
+
+
+@pytest.mark.asyncio
+async def test_user_token_cache_is_invalidated(storage_manager):
+    user_id = 'google-sub'
+    await storage_manager.save_user_token(user_id, {'access_token': 'abc'})
+
+    cached = await storage_manager.get_user_token(user_id)
+    cached['access_token'] = 'mutated'
+    assert await storage_manager.get_user_token(user_id) == {'access_token': 'abc'}
+
+    await storage_manager.save_user_token(user_id, {'access_token': 'xyz'})
+    assert await storage_manager.get_user_token(user_id) == {'access_token': 'xyz'}
+
+    assert await storage_manager.delete_user_token(user_id) is True
+    assert await storage_manager.get_user_token(user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_access_token(storage_manager):
+    await storage_manager.save_user_token('google-sub', {'access_token': 'abc', 'expires_in': 1})
+    assert await storage_manager.get_access_token('google-sub') == 'abc'
+
+    storage_manager.invalidate_user_token('google-sub')
+    assert await storage_manager.get_access_token('google-sub') == 'abc'
+
+    await storage_manager.save_user_token('no-access', {'refresh_token': 'def'})
+    storage_manager.invalidate_user_token('no-access')
+    assert await storage_manager.get_access_token('no-access') is None
+
+    assert await storage_manager.get_access_token('missing') is None
+
+
+@pytest.mark.asyncio
+async def test_telegram_user_mapping_flow(storage_manager):
+    await storage_manager.save_telegram_user_mapping('111', 'sub-a')
+    assert await storage_manager.get_google_sub_for_telegram_id('111') == 'sub-a'
+    assert await storage_manager.get_telegram_id_for_google_sub('sub-a') == '111'
+
+    await storage_manager.save_telegram_user_mapping('111', 'sub-b')
+    assert await storage_manager.get_google_sub_for_telegram_id('111') == 'sub-b'
+    assert await storage_manager.get_telegram_id_for_google_sub('sub-a') is None
+
+    assert await storage_manager.get_google_sub_for_telegram_id('222') is None
+
+
+async def test_telegram_user_mapping_lookups_are_cached(storage_manager):
+    await storage_manager.save_telegram_user_mapping('111', 'sub-a')
+    storage_manager.google_sub_cache.invalidate('111')
+    storage_manager.telegram_id_cache.invalidate('sub-a')
+
+    assert await storage_manager.get_telegram_id_for_google_sub('sub-a') == '111'
+    assert storage_manager.google_sub_cache.get('111') == 'sub-a'
+
+
+async def test_get_google_sub_and_token(storage_manager):
+    assert await storage_manager.get_google_sub_and_token('111') == (None, None)
+
+    await storage_manager.save_telegram_user_mapping('111', 'sub-a')
+    assert await storage_manager.get_google_sub_and_token('111') == ('sub-a', None)
+
+    token_data = {'access_token': 'abc'}
+    await storage_manager.save_user_token('sub-a', token_data)
+    storage_manager.google_sub_cache.invalidate('111')
+    storage_manager.invalidate_user_token('sub-a')
+    assert await storage_manager.get_google_sub_and_token('111') == ('sub-a', token_data)
+    assert storage_manager.token_cache.get('sub-a') == token_data
+
+
+async def test_unauthenticated_lookup_is_cached_until_credentials_are_written(storage_manager):
+    assert await storage_manager.get_google_sub_and_token('111') == (None, None)
+    assert storage_manager.unauthenticated_users.get('111') is True
+
+    await storage_manager.save_telegram_user_mapping('111', 'sub-a')
+    assert storage_manager.unauthenticated_users.get('111') is None
+    assert await storage_manager.get_google_sub_and_token('111') == ('sub-a', None)
+    assert storage_manager.unauthenticated_users.get('111') is True
+
+    token_data = {'access_token': 'abc'}
+    await storage_manager.save_user_token('sub-a', token_data)
+    assert await storage_manager.get_google_sub_and_token('111') == ('sub-a', token_data)
@@ -0,0 +1,99 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+from pydantic_ai.models.test import TestModel
+
+from managers.agent_manager import AgentManager
+from utils import NOOP_LOG
+from utils.tasks import TaskCoordinator
+
+
+async def test_shutdown_waits_for_tasks_in_flight():
+    coordinator = TaskCoordinator(1)
+    release = asyncio.Event()
+    finished = []
+
+    async def work():
+        await release.wait()
+        finished.append('work')
+
+    coordinator.start_task('work', work())
+    shutdown = asyncio.ensure_future(coordinator.shutdown())
+    await asyncio.sleep(0)
+    assert not shutdown.done()
+
+    release.set()
+    await shutdown
+    assert finished == ['work']
+    assert coordinator.tasks == {}
+
+
+async def test_shutdown_cancels_timers_armed_by_tasks_in_flight():
+    coordinator = TaskCoordinator(1)
+    started = []
+
+    async def later():
+        started.append('later')
+
+    async def work():
+        await asyncio.sleep(0)
+        coordinator.start_task_later('later', 0, later)
+
+    coordinator.start_task_later('early', 0, later)
+    coordinator.start_task('work', work())
+    await coordinator.shutdown()
+    await asyncio.sleep(0.01)
+
+    assert started == []
+    assert coordinator.timers == {}
+
+
+async def test_shutdown_survives_failed_tasks():
+    coordinator = TaskCoordinator(1)
+
+    async def fail():
+        raise RuntimeError('boom')
+
+    coordinator.start_task('fail', fail())
+    await coordinator.shutdown()
+    assert coordinator.tasks == {}
+
+
+async def test_exclusive_releases_per_key_locks():
+    coordinator = TaskCoordinator(2)
+    order = []
+
+    async def turn(name: str):
+        async with coordinator.exclusive('user'):
+            order.append(f'{name}-start')
+            await asyncio.sleep(0)
+            order.append(f'{name}-end')
+
+    await asyncio.gather(turn('a'), turn('b'))
+    assert order == ['a-start', 'a-end', 'b-start', 'b-end']
+    assert coordinator.locks == {}
+    assert coordinator.lock_waiters == {}
+
+
+async def test_shutdown_flushes_history_save_in_flight():
+    coordinator = TaskCoordinator(1)
+    release = asyncio.Event()
+    services = AsyncMock()
+    services.get_conversation_history.return_value = []
+
+    async def save_conversation_history(*_args, **_kwargs):
+        await release.wait()
+
+    services.save_conversation_history.side_effect = save_conversation_history
+    agent_manager = AgentManager(TestModel(), services, NOOP_LOG, coordinator)
+
+    await agent_manager.run_agent('hello', 'user', 'user@example.com', 'UTC')
+    assert coordinator.get_task('history:user') is not None
+
+    shutdown = asyncio.ensure_future(coordinator.shutdown())
+    await asyncio.sleep(0)
+    assert not shutdown.done()
+
+    release.set()
+    await shutdown
+    services.save_conversation_history.assert_awaited_once()
@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from ui.telegram.handlers import AUTH_REPLY_COOLDOWN, AUTH_REQUIRED_MESSAGE, reply_auth_required
+import utils
+from utils import TTLCache
+
+
+def create_message(chat_id: int) -> MagicMock:
+    message = MagicMock(chat_id=chat_id)
+    message.reply_text = AsyncMock()
+    return message
+
+
+async def test_repeated_auth_reply_is_suppressed_and_logged(monkeypatch):
+    monkeypatch.setattr(utils, 'monotonic', lambda: 1000.0)
+    auth_replies: TTLCache[bool] = TTLCache(10)
+    message = create_message(5)
+    logger = MagicMock()
+
+    await reply_auth_required(message, auth_replies, logger)
+    await reply_auth_required(message, auth_replies, logger)
+
+    message.reply_text.assert_awaited_once_with(AUTH_REQUIRED_MESSAGE, parse_mode='HTML')
+    logger.assert_called_once_with(
+        'Suppressed repeated auth-required reply to chat %s', 'debug', '5'
+    )
+
+
+async def test_auth_reply_is_sent_again_after_cooldown(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(utils, 'monotonic', lambda: now[0])
+    auth_replies: TTLCache[bool] = TTLCache(10)
+    message = create_message(5)
+    logger = MagicMock()
+
+    await reply_auth_required(message, auth_replies, logger)
+    now[0] += AUTH_REPLY_COOLDOWN
+    await reply_auth_required(message, auth_replies, logger)
+
+    assert message.reply_text.await_count == 2
+    logger.assert_not_called()
@@ -37,5 +37,5 @@ class BaseValidator:
             raise ExceptionGroup('Multiple validation errors occurred', self._errors)
         else:
             exc_group = ExceptionGroup('Multiple validation errors occurred', self._errors)
-            error_messages = '\n'.join(str(e) for e in self._errors)
+            error_messages = '\n'.join(map(str, self._errors))
             raise self._raises(error_messages) from exc_group
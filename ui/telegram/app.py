@@ -1,7 +1,9 @@
+import asyncio
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from telegram import BotCommand, InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic_ai.models.google import GoogleModel
+from telegram import BotCommand
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, MessageHandler, filters
 
 from managers.adapters import AiAgentAdapter
@@ -11,8 +13,11 @@ from managers.google_services_manager import GoogleServicesManager
 from managers.schedule_manager import ScheduleManager
 from managers.storage_manager import StorageManager
 from ui.telegram.handlers import (
+    CONFIRMATION_MARKUP,
+    PENDING_EVENT_TTL,
     handle_add,
-    handle_confirmation_callback,
+    handle_cancel_event,
+    handle_confirm_event,
     handle_list,
     handle_logout,
     handle_menu,
@@ -22,7 +27,12 @@ from ui.telegram.handlers import (
     handle_reminders,
     handle_start,
 )
-from utils import LogFunction
+from utils import LogFunction, TTLCache
+from utils.tasks import TaskCoordinator
+
+PENDING_EVENTS_SIZE = 10_000
+REMINDER_SEND_CONCURRENCY = 10
+AUTH_REPLIES_SIZE = 10_000
 
 
 class TelegramAgentAdapter(AiAgentAdapter):
@@ -75,15 +85,9 @@ class TelegramAgentAdapter(AiAgentAdapter):
             f'📝 <b>Description:</b> {description}'
         )
 
-        keyboard = [
-            [
-                InlineKeyboardButton('✅ Confirm', callback_data='confirm_event'),
-                InlineKeyboardButton('❌ Cancel', callback_data='cancel_event'),
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        await self.send_message_callback(telegram_id, message, reply_markup, event_data, 'HTML')
+        await self.send_message_callback(
+            telegram_id, message, CONFIRMATION_MARKUP, event_data, 'HTML'
+        )
 
         return "✨ I've prepared your event! Please check the confirmation buttons above."
 
@@ -94,14 +98,15 @@ def create_telegram_agent_adapter_and_manager(
     google_services_manager: GoogleServicesManager,
     bot_application: Application,
     logger: LogFunction,
-    google_api_key: str,
+    agent_model: GoogleModel,
+    coordinator: TaskCoordinator,
 ):
-    pending_events = {}
+    pending_events: TTLCache[dict] = TTLCache(PENDING_EVENTS_SIZE)
 
     async def send_message_with_confirmation(
         user_id: int, message: str, reply_markup, event_data: dict, parse_mode: str = None
     ):
-        pending_events[user_id] = event_data
+        pending_events.set(str(user_id), event_data, PENDING_EVENT_TTL)
         await bot_application.bot.send_message(
             chat_id=user_id, text=message, reply_markup=reply_markup, parse_mode=parse_mode
         )
@@ -114,13 +119,20 @@ def create_telegram_agent_adapter_and_manager(
         send_message_with_confirmation,
     )
 
-    agent_manager = AgentManager(google_api_key, services=telegram_adapter, logger=logger)
+    agent_manager = AgentManager(
+        agent_model, services=telegram_adapter, logger=logger, coordinator=coordinator
+    )
 
     return agent_manager, pending_events
 
 
 def create_bot_application() -> Application:
-    return Application.builder().token(config_manager.telegram_bot_token).build()
+    return (
+        Application.builder()
+        .token(config_manager.telegram_bot_token)
+        .concurrent_updates(True)
+        .build()
+    )
 
 
 def register_handlers(application: Application) -> None:
@@ -135,9 +147,8 @@ def register_handlers(application: Application) -> None:
 
     application.add_handler(CommandHandler('logout', handle_logout))
 
-    application.add_handler(
-        CallbackQueryHandler(handle_confirmation_callback, pattern='^(confirm_event|cancel_event)$')
-    )
+    application.add_handler(CallbackQueryHandler(handle_confirm_event, pattern='^confirm_event$'))
+    application.add_handler(CallbackQueryHandler(handle_cancel_event, pattern='^cancel_event$'))
 
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
 
@@ -162,7 +173,8 @@ async def start_telegram_bot(
     schedule_manager: ScheduleManager,
     google_services_manager: GoogleServicesManager,
     logger: LogFunction,
-    google_api_key: str,
+    agent_model: GoogleModel,
+    coordinator: TaskCoordinator,
 ) -> None:
     logger('Starting Telegram Bot', 'info')
 
@@ -177,32 +189,28 @@ async def start_telegram_bot(
         google_services_manager,
         bot_application,
         logger,
-        google_api_key,
+        agent_model,
+        coordinator,
     )
 
     bot_application.bot_data['agent_manager'] = agent_manager
+    bot_application.bot_data['task_coordinator'] = coordinator
     bot_application.bot_data['pending_events'] = pending_events
+    bot_application.bot_data['auth_replies'] = TTLCache(AUTH_REPLIES_SIZE)
 
-    async def notifier(user_id: str, message: str):
+    send_slots = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+
+    async def notifier(user_id: str, telegram_chat_id: str, message: str):
         try:
-            telegram_id_str = user_id
-            
-            if len(user_id) > 15:
-                telegram_id_str = await storage_manager.get_telegram_id_for_google_sub(user_id)
-                if not telegram_id_str:
-                    logger(f'Failed to find telegram_id for user {user_id}', 'warning')
-                    telegram_id_str = user_id
-            
-            await bot_application.bot.send_message(
-                chat_id=telegram_id_str,
-                text=message,
-                parse_mode='HTML'
-            )
+            async with send_slots:
+                await bot_application.bot.send_message(
+                    chat_id=telegram_chat_id, text=message, parse_mode='HTML'
+                )
         except Exception as exc:
             logger(f'Failed to send reminder to {user_id}: {exc}', 'error')
 
     schedule_manager.set_callback(notifier)
-    schedule_manager.on_start = storage_manager.get_all_reminders
+    schedule_manager.on_start = storage_manager.stream_all_reminders
     await schedule_manager.start()
 
     await bot_application.updater.start_polling()
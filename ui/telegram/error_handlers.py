@@ -16,11 +16,10 @@ def build_validation_on_errors(action: str, logger: LogFunction) -> Callable[[Er
                 if line:
                     messages.append(line)
 
-        count = len(messages) if messages else len(errors)
-        error_summary = f'{count} Validation errors in {action}:'
+        if not messages:
+            messages = [str(err) for err in errors]
 
-        logger(error_summary, 'error')
-        for msg in messages if messages else (str(e) for e in errors):
-            logger(f'- {msg}', 'error')
+        details = ''.join(f'\n- {msg}' for msg in messages)
+        logger('%d Validation errors in %s:%s', 'error', len(messages), action, details)
 
     return on_errors
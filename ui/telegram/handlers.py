@@ -1,8 +1,8 @@
 from datetime import datetime, timedelta
-from urllib.parse import urlparse
-from zoneinfo import ZoneInfo
+from typing import Any
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+import httpx
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
 from telegram.ext import ContextTypes
 
 from managers.agent_manager import AgentManager
@@ -16,7 +16,92 @@ from ui.telegram.validator import (
     parse_reminder_add_args,
     parse_reminder_del_args,
 )
-from utils import LogFunction
+from utils import LogFunction, TTLCache, get_zoneinfo
+from utils.tasks import TaskCoordinator
+
+PENDING_EVENT_TTL = 900
+AUTH_REPLY_COOLDOWN = 10
+LOGIN_BUTTON_TEXT = '🔐 Login with Google Calendar'
+CONFIRMATION_MARKUP = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton('✅ Confirm', callback_data='confirm_event'),
+            InlineKeyboardButton('❌ Cancel', callback_data='cancel_event'),
+        ]
+    ]
+)
+
+WELCOME_BACK_MESSAGE = (
+    '✨ <b>Welcome back!</b>\n\n'
+    "You're already authenticated! Here's what you can do:\n\n"
+    '📅 <b>Calendar Events:</b>\n'
+    '• Chat with me naturally to create events\n'
+    '• /events - View your upcoming events\n'
+    '• /newevent - Quick event creation\n\n'
+    '⏰ <b>Periodic Reminders:</b>\n'
+    '• /newreminder - Create a recurring reminder\n'
+    '• /myreminders - View all your reminders\n'
+    '• /deletereminder - Remove a reminder\n\n'
+    '💬 Just send me a message to get started!'
+)
+WELCOME_MESSAGE = (
+    '👋 <b>Welcome to your Personal Calendar Assistant!</b>\n\n'
+    'I can help you manage your Google Calendar events and set up recurring reminders.\n\n'
+    'To get started, please authenticate with your Google account:'
+)
+MENU_MESSAGE = (
+    '📋 <b>Main Menu</b>\n\n'
+    "Here's what you can do:\n\n"
+    '📅 <b>Calendar Events:</b>\n'
+    '• Chat with me naturally to create events\n'
+    '• /events - View your upcoming events\n'
+    '• /newevent - Quick event creation\n\n'
+    '⏰ <b>Periodic Reminders:</b>\n'
+    '• /newreminder - Create a recurring reminder\n'
+    '• /myreminders - View all your reminders\n'
+    '• /deletereminder - Remove a reminder\n\n'
+    '🔧 <b>Other Commands:</b>\n'
+    '• /logout - Logout from Google\n'
+    '• /menu - Show this menu\n\n'
+    '💬 Just send me a message to get started!'
+)
+AUTH_REQUIRED_MESSAGE = (
+    '🔐 <b>Authentication Required</b>\n\nPlease authenticate first using /start'
+)
+AUTH_EXPIRED_MESSAGE = '❌ <b>Authentication Expired</b>\n\nPlease use /start to login again.'
+NO_PENDING_EVENT_MESSAGE = '❌ <b>Error</b>\n\nNo pending event found.'
+NO_ACCESS_TOKEN_MESSAGE = '❌ <b>Error</b>\n\nAccess token not found.'
+EVENT_CANCELLED_MESSAGE = '🚫 <b>Event Cancelled</b>\n\nThe event was not created.'
+NO_EVENTS_MESSAGE = (
+    '📅 <b>No Upcoming Events</b>\n\n'
+    "You don't have any upcoming events on your calendar.\n\n"
+    '💬 Try chatting with me to create one!'
+)
+NO_REMINDERS_MESSAGE = (
+    '⏰ <b>No Reminders</b>\n\n'
+    "You don't have any recurring reminders set up.\n\n"
+    '💡 Use /newreminder to create one!'
+)
+NOT_LOGGED_IN_MESSAGE = (
+    'ℹ️ <b>Not Logged In</b>\n\nYou are not currently logged in.\n\nUse /start to login with Google.'
+)
+LOGGED_OUT_MESSAGE = (
+    '👋 <b>Logged Out</b>\n\nYou have been successfully logged out.\n\nUse /start to login again.'
+)
+LOGOUT_FAILED_MESSAGE = (
+    '❌ <b>Logout Failed</b>\n\nThere was an error logging you out. Please try again.'
+)
+
+
+async def reply_auth_required(
+    message: Message, auth_replies: TTLCache[bool], logger: LogFunction
+) -> None:
+    chat_key = str(message.chat_id)
+    if auth_replies.get(chat_key):
+        logger('Suppressed repeated auth-required reply to chat %s', 'debug', chat_key)
+        return
+    auth_replies.set(chat_key, True, AUTH_REPLY_COOLDOWN)
+    await message.reply_text(AUTH_REQUIRED_MESSAGE, parse_mode='HTML')
 
 
 async def get_user_id_for_telegram(storage_manager: StorageManager, telegram_id: int) -> str | None:
@@ -25,7 +110,18 @@ async def get_user_id_for_telegram(storage_manager: StorageManager, telegram_id:
     return google_sub
 
 
-def build_login_url(base_url: str, telegram_id: int) -> str:
+async def get_authenticated_user(
+    storage_manager: StorageManager, telegram_id: int
+) -> tuple[str, dict[str, Any]] | None:
+    google_sub, token_data = await storage_manager.get_google_sub_and_token(str(telegram_id))
+    if not google_sub or not token_data:
+        return None
+
+    return google_sub, token_data
+
+
+def build_login_url(telegram_id: int) -> str:
+    base_url = config_manager.redirect_base_url
     return f'{base_url}/login?telegram_id={telegram_id}&from_telegram=true'
 
 
@@ -39,39 +135,14 @@ async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     logger(f'User {user_id} started the bot', 'info')
 
-    google_sub = await get_user_id_for_telegram(storage_manager, user_id)
-    if google_sub:
-        token_data = await storage_manager.get_user_token(google_sub)
-        if token_data:
-            welcome_msg = (
-                "✨ <b>Welcome back!</b>\n\n"
-                "You're already authenticated! Here's what you can do:\n\n"
-                "📅 <b>Calendar Events:</b>\n"
-                "• Chat with me naturally to create events\n"
-                "• /events - View your upcoming events\n"
-                "• /newevent - Quick event creation\n\n"
-                "⏰ <b>Periodic Reminders:</b>\n"
-                "• /newreminder - Create a recurring reminder\n"
-                "• /myreminders - View all your reminders\n"
-                "• /deletereminder - Remove a reminder\n\n"
-                "💬 Just send me a message to get started!"
-            )
-            await update.message.reply_text(welcome_msg, parse_mode='HTML')
-            return
+    if await get_authenticated_user(storage_manager, user_id):
+        await update.message.reply_text(WELCOME_BACK_MESSAGE, parse_mode='HTML')
+        return
 
-    parsed = urlparse(config_manager.redirect_url)
-    base_url = f'{parsed.scheme}://{parsed.netloc}'
-    login_url = build_login_url(base_url, user_id)
-    
-    keyboard = [[InlineKeyboardButton('🔐 Login with Google Calendar', url=login_url)]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    welcome_msg = (
-        "👋 <b>Welcome to your Personal Calendar Assistant!</b>\n\n"
-        "I can help you manage your Google Calendar events and set up recurring reminders.\n\n"
-        "To get started, please authenticate with your Google account:"
-    )
-    await update.message.reply_text(welcome_msg, reply_markup=reply_markup, parse_mode='HTML')
+    login_button = InlineKeyboardButton(LOGIN_BUTTON_TEXT, url=build_login_url(user_id))
+    reply_markup = InlineKeyboardMarkup([[login_button]])
+
+    await update.message.reply_text(WELCOME_MESSAGE, reply_markup=reply_markup, parse_mode='HTML')
 
 
 async def handle_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -79,44 +150,17 @@ async def handle_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     storage_manager: StorageManager = context.bot_data['storage_manager']
+    logger: LogFunction = context.bot_data['logger']
+    auth_replies: TTLCache[bool] = context.bot_data['auth_replies']
 
     user_id = update.effective_user.id
 
-    google_sub = await get_user_id_for_telegram(storage_manager, user_id)
-    if not google_sub:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
-        return
-    
-    token_data = await storage_manager.get_user_token(google_sub)
-    if not token_data:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
+    auth = await get_authenticated_user(storage_manager, user_id)
+    if not auth:
+        await reply_auth_required(update.message, auth_replies, logger)
         return
 
-    menu_msg = (
-        "📋 <b>Main Menu</b>\n\n"
-        "Here's what you can do:\n\n"
-        "📅 <b>Calendar Events:</b>\n"
-        "• Chat with me naturally to create events\n"
-        "• /events - View your upcoming events\n"
-        "• /newevent - Quick event creation\n\n"
-        "⏰ <b>Periodic Reminders:</b>\n"
-        "• /newreminder - Create a recurring reminder\n"
-        "• /myreminders - View all your reminders\n"
-        "• /deletereminder - Remove a reminder\n\n"
-        "🔧 <b>Other Commands:</b>\n"
-        "• /logout - Logout from Google\n"
-        "• /menu - Show this menu\n\n"
-        "💬 Just send me a message to get started!"
-    )
-    await update.message.reply_text(menu_msg, parse_mode='HTML')
+    await update.message.reply_text(MENU_MESSAGE, parse_mode='HTML')
 
 
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -126,29 +170,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     agent_manager: AgentManager = context.bot_data['agent_manager']
     storage_manager: StorageManager = context.bot_data['storage_manager']
     logger: LogFunction = context.bot_data['logger']
+    auth_replies: TTLCache[bool] = context.bot_data['auth_replies']
 
     telegram_id = update.effective_user.id
     user_message = update.message.text
 
     logger(f'User {telegram_id} sent message: {user_message}', 'info')
-    
-    google_sub = await get_user_id_for_telegram(storage_manager, telegram_id)
-    if not google_sub:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
-        return
-    
-    token_data = await storage_manager.get_user_token(google_sub)
-    if not token_data:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
+
+    auth = await get_authenticated_user(storage_manager, telegram_id)
+    if not auth:
+        await reply_auth_required(update.message, auth_replies, logger)
         return
+    google_sub, token_data = auth
 
     user_email = token_data.get('userinfo', {}).get('email', 'unknown')
     user_timezone = token_data.get('userinfo', {}).get('timezone', 'UTC')
@@ -158,7 +191,7 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(response)
 
 
-async def handle_confirmation_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def handle_confirm_event(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.callback_query or not update.effective_user:
         return
     
@@ -168,43 +201,27 @@ async def handle_confirmation_callback(update: Update, context: ContextTypes.DEF
     storage_manager: StorageManager = context.bot_data['storage_manager']
     google_services_manager: GoogleServicesManager = context.bot_data['google_services_manager']
     logger: LogFunction = context.bot_data['logger']
-    pending_events: dict = context.bot_data.get('pending_events', {})
+    pending_events: TTLCache[dict] = context.bot_data['pending_events']
 
     telegram_id = update.effective_user.id
 
-    if query.data == 'confirm_event':
-        google_sub = await get_user_id_for_telegram(storage_manager, telegram_id)
-        if not google_sub:
-            await query.edit_message_text(
-                "❌ <b>Authentication Expired</b>\n\nPlease use /start to login again.",
-                parse_mode='HTML'
-            )
-            return
-
-        pending_event = pending_events.get(telegram_id)
-        if not pending_event:
-            await query.edit_message_text(
-                "❌ <b>Error</b>\n\nNo pending event found.",
-                parse_mode='HTML'
-            )
-            return
+    auth = await get_authenticated_user(storage_manager, telegram_id)
+    if not auth:
+        await query.edit_message_text(AUTH_EXPIRED_MESSAGE, parse_mode='HTML')
+        return
+    token_data = auth[1]
 
-        token_data = await storage_manager.get_user_token(google_sub)
-        if not token_data:
-            await query.edit_message_text(
-                "❌ <b>Authentication Expired</b>\n\nPlease use /start to login again.",
-                parse_mode='HTML'
-            )
-            return
+    access_token = token_data.get('access_token')
+    if not access_token:
+        await query.edit_message_text(NO_ACCESS_TOKEN_MESSAGE, parse_mode='HTML')
+        return
 
-        access_token = token_data.get('access_token')
-        if not access_token:
-            await query.edit_message_text(
-                "❌ <b>Error</b>\n\nAccess token not found.",
-                parse_mode='HTML'
-            )
-            return
+    pending_event = pending_events.pop(str(telegram_id))
+    if not pending_event:
+        await query.edit_message_text(NO_PENDING_EVENT_MESSAGE, parse_mode='HTML')
+        return
 
+    try:
         result = await google_services_manager.create_calendar_event(
             access_token,
             pending_event['event_name'],
@@ -213,24 +230,36 @@ async def handle_confirmation_callback(update: Update, context: ContextTypes.DEF
             pending_event['description'],
             pending_event['event_timezone'],
         )
-
-        pending_events.pop(telegram_id, None)
-
-        html_link = result.get('htmlLink', 'N/A')
+    except Exception as e:
+        logger(f'Error creating event for user {telegram_id}: {e}', 'error')
+        pending_events.set(str(telegram_id), pending_event, PENDING_EVENT_TTL)
         await query.edit_message_text(
-            f"✅ <b>Event Created!</b>\n\n"
-            f"Your event has been added to Google Calendar.\n\n"
-            f"🔗 <a href='{html_link}'>View in Calendar</a>",
-            parse_mode='HTML'
+            f'❌ <b>Error</b>\n\n{e}\n\nTap Confirm to try again.',
+            reply_markup=CONFIRMATION_MARKUP,
+            parse_mode='HTML',
         )
-        logger(f'Event created for user {telegram_id}', 'info')
+        return
 
-    elif query.data == 'cancel_event':
-        pending_events.pop(telegram_id, None)
-        await query.edit_message_text(
-            "🚫 <b>Event Cancelled</b>\n\nThe event was not created.",
-            parse_mode='HTML'
-        )
+    html_link = result.get('htmlLink', 'N/A')
+    await query.edit_message_text(
+        f"✅ <b>Event Created!</b>\n\n"
+        f"Your event has been added to Google Calendar.\n\n"
+        f"🔗 <a href='{html_link}'>View in Calendar</a>",
+        parse_mode='HTML'
+    )
+    logger(f'Event created for user {telegram_id}', 'info')
+
+
+async def handle_cancel_event(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.callback_query or not update.effective_user:
+        return
+
+    query = update.callback_query
+    await query.answer()
+
+    pending_events: TTLCache[dict] = context.bot_data['pending_events']
+    pending_events.invalidate(str(update.effective_user.id))
+    await query.edit_message_text(EVENT_CANCELLED_MESSAGE, parse_mode='HTML')
 
 
 async def handle_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -238,41 +267,42 @@ async def handle_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     storage_manager: StorageManager = context.bot_data['storage_manager']
+    http_client: httpx.AsyncClient = context.bot_data['http_client']
+    coordinator: TaskCoordinator = context.bot_data['task_coordinator']
     google_services_manager: GoogleServicesManager = context.bot_data['google_services_manager']
     logger: LogFunction = context.bot_data['logger']
+    auth_replies: TTLCache[bool] = context.bot_data['auth_replies']
 
     telegram_id = update.effective_user.id
 
-    google_sub = await get_user_id_for_telegram(storage_manager, telegram_id)
-    if not google_sub:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
+    auth = await get_authenticated_user(storage_manager, telegram_id)
+    if not auth:
+        await reply_auth_required(update.message, auth_replies, logger)
         return
+    google_sub, token_data = auth
 
     try:
         events = await list_upcoming_events(
-            storage_manager, google_services_manager, logger, google_sub
+            http_client,
+            storage_manager,
+            coordinator,
+            google_services_manager,
+            logger,
+            google_sub,
+            token_data,
         )
 
         if not events:
-            await update.message.reply_text(
-                "📅 <b>No Upcoming Events</b>\n\n"
-                "You don't have any upcoming events on your calendar.\n\n"
-                "💬 Try chatting with me to create one!",
-                parse_mode='HTML'
-            )
+            await update.message.reply_text(NO_EVENTS_MESSAGE, parse_mode='HTML')
             return
 
-        message = '📅 <b>Your Upcoming Events:</b>\n\n'
+        parts = ['📅 <b>Your Upcoming Events:</b>\n\n']
         for event in events:
             summary = event.get('summary', 'No title')
             start = event.get('start', {}).get('dateTime', 'No date')
-            message += f'• <b>{summary}</b>\n  📆 {start}\n\n'
+            parts.append(f'• <b>{summary}</b>\n  📆 {start}\n\n')
 
-        await update.message.reply_text(message, parse_mode='HTML')
+        await update.message.reply_text(''.join(parts), parse_mode='HTML')
     except Exception as e:
         logger(f'Error listing events for user {telegram_id}: {e}', 'error')
         await update.message.reply_text(
@@ -286,29 +316,32 @@ async def handle_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     storage_manager: StorageManager = context.bot_data['storage_manager']
+    http_client: httpx.AsyncClient = context.bot_data['http_client']
+    coordinator: TaskCoordinator = context.bot_data['task_coordinator']
     google_services_manager: GoogleServicesManager = context.bot_data['google_services_manager']
     logger: LogFunction = context.bot_data['logger']
+    auth_replies: TTLCache[bool] = context.bot_data['auth_replies']
 
     telegram_id = update.effective_user.id
 
-    google_sub = await get_user_id_for_telegram(storage_manager, telegram_id)
-    if not google_sub:
-        await update.message.reply_text(
-            "🔐 <b>Authentication Required</b>\n\n"
-            "Please authenticate first using /start",
-            parse_mode='HTML'
-        )
+    auth = await get_authenticated_user(storage_manager, telegram_id)
+    if not auth:
+        await reply_auth_required(update.message, auth_replies, logger)
         return
+    google_sub, token_data = auth
 
     try:
         args = context.args
         parsed = parse_add_command_args(args)
 
         event = await create_event(
+            http_client,
             storage_manager,
+            coordinator,
             google_services_manager,
             logger,
             google_sub,
+            token_data,
             parsed['summary'],
             parsed['datetime'],
         )
@@ -340,23 +373,18 @@ async def handle_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE):
     reminders = await storage_manager.get_reminders(str(telegram_id))
 
     if not reminders:
-        await update.message.reply_text(
-            "⏰ <b>No Reminders</b>\n\n"
-            "You don't have any recurring reminders set up.\n\n"
-            "💡 Use /newreminder to create one!",
-            parse_mode='HTML'
-        )
+        await update.message.reply_text(NO_REMINDERS_MESSAGE, parse_mode='HTML')
         return
 
-    message = '⏰ <b>Your Periodic Reminders:</b>\n\n'
-    for reminder in reminders:
-        message += (
-            f"🔔 <b>ID #{reminder['id']}</b>\n"
-            f"   📝 {reminder['message']}\n"
-            f"   🕐 <code>{reminder['cron']}</code>\n\n"
-        )
+    parts = ['⏰ <b>Your Periodic Reminders:</b>\n\n']
+    parts.extend(
+        f"🔔 <b>ID #{reminder['id']}</b>\n"
+        f"   📝 {reminder['message']}\n"
+        f"   🕐 <code>{reminder['cron']}</code>\n\n"
+        for reminder in reminders
+    )
 
-    await update.message.reply_text(message, parse_mode='HTML')
+    await update.message.reply_text(''.join(parts), parse_mode='HTML')
 
 
 async def handle_reminder_add(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -449,40 +477,31 @@ async def handle_logout(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     google_sub = await get_user_id_for_telegram(storage_manager, telegram_id)
     if not google_sub:
-        await update.message.reply_text(
-            "ℹ️ <b>Not Logged In</b>\n\n"
-            "You are not currently logged in.\n\n"
-            "Use /start to login with Google.",
-            parse_mode='HTML'
-        )
+        await update.message.reply_text(NOT_LOGGED_IN_MESSAGE, parse_mode='HTML')
         return
 
     success = await storage_manager.delete_user_token(google_sub)
 
     if success:
-        await update.message.reply_text(
-            "👋 <b>Logged Out</b>\n\n"
-            "You have been successfully logged out.\n\n"
-            "Use /start to login again.",
-            parse_mode='HTML'
-        )
+        await update.message.reply_text(LOGGED_OUT_MESSAGE, parse_mode='HTML')
         logger(f'User {telegram_id} logged out', 'info')
     else:
-        await update.message.reply_text(
-            "❌ <b>Logout Failed</b>\n\n"
-            "There was an error logging you out. Please try again.",
-            parse_mode='HTML'
-        )
+        await update.message.reply_text(LOGOUT_FAILED_MESSAGE, parse_mode='HTML')
 
 
 async def list_upcoming_events(
+    http_client: httpx.AsyncClient,
     storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
     google_services_manager: GoogleServicesManager,
     logger: LogFunction,
     google_sub: str,
+    token_data: dict[str, Any],
     user_timezone: str = 'UTC',
 ):
-    token_data = await user_tokens.get_valid_token(storage_manager, google_sub, logger)
+    token_data = await user_tokens.get_valid_token(
+        http_client, storage_manager, coordinator, google_sub, token_data, logger
+    )
     if not token_data:
         raise ValueError('User not authenticated')
 
@@ -490,22 +509,27 @@ async def list_upcoming_events(
     if not access_token:
         raise ValueError('Access token not found')
 
-    tz = ZoneInfo(user_timezone)
+    tz = get_zoneinfo(user_timezone)
     now = datetime.now(tz)
     events = await google_services_manager.list_upcoming_events(access_token, now, tz)
     return events
 
 
 async def create_event(
+    http_client: httpx.AsyncClient,
     storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
     google_services_manager: GoogleServicesManager,
     logger: LogFunction,
     google_sub: str,
+    token_data: dict[str, Any],
     summary: str,
     start_dt: datetime,
     user_timezone: str = 'UTC',
 ):
-    token_data = await user_tokens.get_valid_token(storage_manager, google_sub, logger)
+    token_data = await user_tokens.get_valid_token(
+        http_client, storage_manager, coordinator, google_sub, token_data, logger
+    )
     if not token_data:
         raise ValueError('User not authenticated')
 
@@ -514,7 +538,7 @@ async def create_event(
         raise ValueError('Access token not found')
 
     end_dt = start_dt + timedelta(hours=1)
-    tz = ZoneInfo(user_timezone)
+    tz = get_zoneinfo(user_timezone)
 
     event = await google_services_manager.create_calendar_event(
         access_token,
@@ -536,8 +560,8 @@ async def add_reminder(
     message: str,
 ):
     logger(f'Adding reminder for user {user_id}: "{message}" with cron "{cron}"', 'info')
-    reminder_id = await storage_manager.add_reminder(str(user_id), cron, message)
-    await schedule_manager.add_reminder(reminder_id, str(user_id), cron, message)
+    reminder_id = await storage_manager.add_reminder(str(user_id), cron, message, str(user_id))
+    await schedule_manager.add_reminder(reminder_id, str(user_id), cron, message, str(user_id))
     logger(f'Reminder {reminder_id} added successfully for user {user_id}', 'info')
     return reminder_id
 
@@ -550,8 +574,9 @@ async def delete_reminder(
     reminder_id: int,
 ):
     logger(f'Deleting reminder {reminder_id} for user {user_id}', 'info')
+    if not await storage_manager.delete_reminder(reminder_id, str(user_id)):
+        raise ValueError(f'Reminder #{reminder_id} not found')
     await schedule_manager.delete_reminder(reminder_id)
-    await storage_manager.delete_reminder(reminder_id)
     logger(f'Reminder {reminder_id} deleted successfully for user {user_id}', 'info')
 
 
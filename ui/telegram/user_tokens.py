@@ -1,13 +1,19 @@
 """User token management for Telegram bot."""
 
+import asyncio
+from functools import partial
 from time import time
 from typing import Any
 
 import httpx
+import orjson
 
 from managers.config_manager import config_manager
 from managers.storage_manager import StorageManager
 from utils import LogFunction
+from utils.tasks import TaskCoordinator
+
+BACKGROUND_REFRESH_LEAD = 360
 
 
 async def save_user_token(
@@ -39,6 +45,7 @@ async def require_user_token(
 
 
 async def refresh_access_token(
+    http_client: httpx.AsyncClient,
     storage_manager: StorageManager,
     user_id: str,
     token_data: dict[str, Any],
@@ -49,67 +56,140 @@ async def refresh_access_token(
         logger(f'No refresh token available for user {user_id}', 'error')
         raise ValueError('No refresh token available')
 
+    now = int(time())
     logger(f'Refreshing access token for user {user_id}', 'info')
+    logger('Token expires_at: %s, current time: %s', 'debug', token_data.get('expires_at'), now)
+
+    logger('Sending token refresh request to Google OAuth for user %s', 'debug', user_id)
+    response = await http_client.post(
+        'https://oauth2.googleapis.com/token',
+        data={
+            'client_id': config_manager.google_oauth2_client_id,
+            'client_secret': config_manager.google_oauth2_secret,
+            'refresh_token': refresh_token,
+            'grant_type': 'refresh_token',
+        },
+    )
+
+    if response.status_code != 200:
+        logger(
+            f'Token refresh failed for user {user_id}: {response.status_code} - {response.text}',
+            'error',
+        )
+        raise ValueError(f'Failed to refresh token: {response.text}')
+
+    logger(f'Token refresh successful for user {user_id}', 'info')
+    new_token_data = orjson.loads(response.content)
+
+    token_data['access_token'] = new_token_data['access_token']
+    token_data['expires_at'] = now + new_token_data.get('expires_in', 3600)
+
+    if 'refresh_token' in new_token_data:
+        token_data['refresh_token'] = new_token_data['refresh_token']
+        logger('New refresh token received for user %s', 'debug', user_id)
+
+    logger('Saving refreshed token to database for user %s', 'debug', user_id)
+    await storage_manager.save_user_token(user_id, token_data)
     logger(
-        f'Token expires_at: {token_data.get("expires_at")}, current time: {int(time())}', 'debug'
+        f'Token refreshed and saved successfully for user {user_id}. New expires_at: {token_data["expires_at"]}',
+        'info',
     )
 
-    async with httpx.AsyncClient() as client:
-        logger(f'Sending token refresh request to Google OAuth for user {user_id}', 'debug')
-        response = await client.post(
-            'https://oauth2.googleapis.com/token',
-            data={
-                'client_id': config_manager.google_oauth2_client_id,
-                'client_secret': config_manager.google_oauth2_secret,
-                'refresh_token': refresh_token,
-                'grant_type': 'refresh_token',
-            },
+    return token_data
+
+
+async def refresh_unless_fresh(
+    http_client: httpx.AsyncClient,
+    storage_manager: StorageManager,
+    user_id: str,
+    token_data: dict[str, Any],
+    logger: LogFunction,
+) -> dict[str, Any]:
+    stored_token = await storage_manager.get_user_token(user_id)
+    if stored_token and stored_token.get('expires_at', 0) > token_data.get('expires_at', 0):
+        logger('Token for user %s was already refreshed by another request', 'debug', user_id)
+        return stored_token
+    return await refresh_access_token(http_client, storage_manager, user_id, token_data, logger)
+
+
+async def refresh_access_token_once(
+    http_client: httpx.AsyncClient,
+    storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
+    user_id: str,
+    token_data: dict[str, Any],
+    logger: LogFunction,
+) -> dict[str, Any]:
+    refresh = coordinator.get_task(f'token-refresh:{user_id}')
+    if refresh is None:
+        refresh = coordinator.start_task(
+            f'token-refresh:{user_id}',
+            refresh_unless_fresh(http_client, storage_manager, user_id, token_data, logger),
         )
+    else:
+        logger('Joining in-flight token refresh for user %s', 'debug', user_id)
 
-        if response.status_code != 200:
-            logger(
-                f'Token refresh failed for user {user_id}: {response.status_code} - {response.text}',
-                'error',
-            )
-            raise ValueError(f'Failed to refresh token: {response.text}')
+    return await asyncio.shield(refresh)
 
-        logger(f'Token refresh successful for user {user_id}', 'info')
-        new_token_data = response.json()
 
-        token_data['access_token'] = new_token_data['access_token']
-        token_data['expires_at'] = int(time()) + new_token_data.get('expires_in', 3600)
+async def refresh_in_background(
+    http_client: httpx.AsyncClient,
+    storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
+    user_id: str,
+    logger: LogFunction,
+) -> None:
+    token_data = await storage_manager.get_user_token(user_id)
+    if not token_data or 'refresh_token' not in token_data:
+        return
 
-        if 'refresh_token' in new_token_data:
-            token_data['refresh_token'] = new_token_data['refresh_token']
-            logger(f'New refresh token received for user {user_id}', 'debug')
+    if token_data.get('expires_at', 0) > int(time()) + BACKGROUND_REFRESH_LEAD:
+        return
 
-        logger(f'Saving refreshed token to database for user {user_id}', 'debug')
-        await storage_manager.save_user_token(user_id, token_data)
-        logger(
-            f'Token refreshed and saved successfully for user {user_id}. New expires_at: {token_data["expires_at"]}',
-            'info',
+    logger('Refreshing token for user %s ahead of expiry', 'debug', user_id)
+    try:
+        await refresh_access_token_once(
+            http_client, storage_manager, coordinator, user_id, token_data, logger
         )
+    except Exception as e:
+        logger(f'Background token refresh failed for user {user_id}: {e}', 'warning')
 
-        return token_data
+
+def schedule_background_refresh(
+    http_client: httpx.AsyncClient,
+    storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
+    user_id: str,
+    expires_at: int,
+    now: int,
+    logger: LogFunction,
+) -> None:
+    delay = expires_at - now - BACKGROUND_REFRESH_LEAD
+    if delay <= 0:
+        return
+
+    coordinator.start_task_later(
+        f'token-refresh-ahead:{user_id}',
+        delay,
+        partial(refresh_in_background, http_client, storage_manager, coordinator, user_id, logger),
+    )
 
 
 async def get_valid_token(
+    http_client: httpx.AsyncClient,
     storage_manager: StorageManager,
+    coordinator: TaskCoordinator,
     user_id: str,
+    token_data: dict[str, Any],
     logger: LogFunction,
 ) -> dict[str, Any] | None:
-    logger(f'Getting valid token for user {user_id}', 'debug')
-    token_data = await storage_manager.get_user_token(user_id)
-    if not token_data:
-        logger(f'No token found in database for user {user_id}', 'warning')
-        return None
-
+    logger('Getting valid token for user %s', 'debug', user_id)
     expires_at = token_data.get('expires_at', 0)
     current_time = int(time())
 
     if expires_at:
         time_until_expiry = expires_at - current_time
-        logger(f'Token for user {user_id} expires in {time_until_expiry} seconds', 'debug')
+        logger('Token for user %s expires in %s seconds', 'debug', user_id, time_until_expiry)
 
         # Refresh if expired or expiring soon (within 5 minutes)
         # OR if we have a negative time_until_expiry (definitely expired)
@@ -119,8 +199,8 @@ async def get_valid_token(
                 'info',
             )
             try:
-                token_data = await refresh_access_token(
-                    storage_manager, user_id, token_data, logger
+                token_data = await refresh_access_token_once(
+                    http_client, storage_manager, coordinator, user_id, token_data, logger
                 )
             except Exception as e:
                 logger(f'Failed to refresh token for user {user_id}: {e}', 'error')
@@ -137,7 +217,17 @@ async def get_valid_token(
                     'warning',
                 )
         else:
-            logger(f'Token for user {user_id} is still valid', 'debug')
+            logger('Token for user %s is still valid', 'debug', user_id)
+
+        schedule_background_refresh(
+            http_client,
+            storage_manager,
+            coordinator,
+            user_id,
+            token_data.get('expires_at', 0),
+            current_time,
+            logger,
+        )
     else:
         logger(f'No expires_at timestamp in token for user {user_id}, assuming valid', 'warning')
 
@@ -145,6 +235,7 @@ async def get_valid_token(
 
 
 async def revoke_google_token(
+    http_client: httpx.AsyncClient,
     token_data: dict[str, Any],
     logger: LogFunction,
 ) -> bool:
@@ -155,32 +246,28 @@ async def revoke_google_token(
 
     logger('Revoking Google OAuth token', 'info')
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://oauth2.googleapis.com/revoke',
-                params={'token': access_token},
-                headers={'content-type': 'application/x-www-form-urlencoded'},
-            )
+        response = await http_client.post(
+            'https://oauth2.googleapis.com/revoke',
+            params={'token': access_token},
+            headers={'content-type': 'application/x-www-form-urlencoded'},
+        )
 
-            if response.status_code == 200:
-                logger('Token revoked successfully', 'info')
-                return True
-            elif response.status_code == 400:
-                logger(
-                    'Token was already invalid or not revocable (400), considering revoked', 'info'
-                )
-                return True
-            else:
-                logger(
-                    f'Token revocation failed: {response.status_code} - {response.text}', 'warning'
-                )
-                return False
+        if response.status_code == 200:
+            logger('Token revoked successfully', 'info')
+            return True
+        elif response.status_code == 400:
+            logger('Token was already invalid or not revocable (400), considering revoked', 'info')
+            return True
+        else:
+            logger(f'Token revocation failed: {response.status_code} - {response.text}', 'warning')
+            return False
     except Exception as e:
         logger(f'Error revoking token: {e}', 'error')
         return False
 
 
 async def delete_user_token(
+    http_client: httpx.AsyncClient,
     storage_manager: StorageManager,
     user_id: str,
     logger: LogFunction,
@@ -189,9 +276,12 @@ async def delete_user_token(
     token_data = await storage_manager.get_user_token(user_id)
 
     if token_data:
-        await revoke_google_token(token_data, logger)
-
-    success = await storage_manager.delete_user_token(user_id)
+        _, success = await asyncio.gather(
+            revoke_google_token(http_client, token_data, logger),
+            storage_manager.delete_user_token(user_id),
+        )
+    else:
+        success = await storage_manager.delete_user_token(user_id)
     if success:
         logger(f'Token deleted successfully for user {user_id}', 'info')
     else:
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime
+import re
 from typing import Callable
 
-from apscheduler.triggers.cron import CronTrigger
 from telegram import Update
 
+from managers.schedule_manager import parse_cron_trigger
 from ui.base import BaseValidator, Errors, ValidationError, noop_on_errors
 
+CRON_FIELD_PATTERN = re.compile(r'[\w*/,?#-]+')
+
 
 class TelegramValidationError(ValidationError):
     pass
@@ -26,13 +29,17 @@ class TelegramValidator(BaseValidator):
 
 
 def parse_add_command_args(args: list[str]) -> dict[str, datetime | str]:
-    text = ' '.join(args)
-    if ' at ' not in text:
-        raise TelegramValidationError(
-            "Missing 'at' separator. Usage: /add [Title] at [YYYY-MM-DD HH:MM]"
-        )
-
-    summary, time_str = text.split(' at ', 1)
+    if len(args) >= 4 and args[-3] == 'at':
+        summary = ' '.join(args[:-3])
+        time_str = f'{args[-2]} {args[-1]}'
+    else:
+        text = ' '.join(args)
+        if ' at ' not in text:
+            raise TelegramValidationError(
+                "Missing 'at' separator. Usage: /add [Title] at [YYYY-MM-DD HH:MM]"
+            )
+
+        summary, time_str = text.split(' at ', 1)
 
     if not summary or not summary.strip():
         raise TelegramValidationError('Summary is required')
@@ -54,11 +61,15 @@ def parse_reminder_add_args(args: list[str]) -> dict[str, str]:
     if len(args) < 6:
         raise TelegramValidationError('Usage: /reminder_add [cron_expression] [message]')
 
-    cron = ' '.join(args[:5])
+    cron_fields = args[:5]
+    if not all(CRON_FIELD_PATTERN.fullmatch(field) for field in cron_fields):
+        raise TelegramValidationError('Invalid cron expression: unexpected characters')
+
+    cron = ' '.join(cron_fields)
     message = ' '.join(args[5:])
 
     try:
-        CronTrigger.from_crontab(cron)
+        parse_cron_trigger(cron)
     except Exception as e:
         raise TelegramValidationError(f'Invalid cron expression: {str(e)}') from e
 
@@ -1,13 +1,25 @@
-import json
+import asyncio
+from hashlib import blake2b
+from importlib.resources import files
+from typing import Any
+from urllib.parse import parse_qsl
 
 from authlib.integrations.starlette_client import OAuth
 import httpx
+import orjson
 from starlette.applications import Starlette
 from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, RedirectResponse, Response
-from starlette.routing import Route
+from starlette.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    Response,
+)
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
 from telegram.ext import Application
 
 from managers.config_manager import config_manager
@@ -15,8 +27,15 @@ from managers.google_services_manager import GoogleServicesManager
 from managers.schedule_manager import ScheduleManager
 from managers.storage_manager import StorageManager
 from ui.web import handlers
-from ui.web.validator import WebValidationError, WebValidator
-from utils import LogFunction
+from ui.web.validator import (
+    WebValidationError,
+    WebValidator,
+    get_access_token_from_session,
+    get_session_timezone,
+    get_user_from_session,
+    is_authenticated,
+)
+from utils import LogFunction, compile_template, pick
 
 oauth = OAuth()
 
@@ -35,6 +54,21 @@ oauth.register(
 )
 
 
+SESSION_USER_KEYS = ('sub', 'email', 'name', 'picture', 'timezone')
+SESSION_TOKEN_KEYS = ('access_token', 'expires_at')
+
+STATIC_PACKAGE = ('ui.web', 'static')
+STATIC_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+GZIP_MINIMUM_SIZE = 500
+GZIP_COMPRESS_LEVEL = 6
+
+
+def static_asset_version(name: str) -> str:
+    package, directory = STATIC_PACKAGE
+    content = files(package).joinpath(directory, name).read_bytes()
+    return blake2b(content, digest_size=8).hexdigest()
+
+
 def build_redirect_uri(base_url: str) -> str:
     return f'{base_url.rstrip("/")}/auth'
 
@@ -144,64 +178,8 @@ CHAT_HTML = """<!DOCTYPE html>
 <html>
 <head>
     <title>AI Assistant Chat</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            max-width: 800px;
-            margin: 50px auto;
-            padding: 20px;
-        }
-        #chat-container {
-            border: 1px solid #ccc;
-            border-radius: 5px;
-            height: 400px;
-            overflow-y: auto;
-            padding: 20px;
-            margin-bottom: 20px;
-            background-color: #f9f9f9;
-        }
-        .message {
-            margin-bottom: 15px;
-            padding: 10px;
-            border-radius: 5px;
-        }
-        .user-message {
-            background-color: #e3f2fd;
-            text-align: right;
-        }
-        .assistant-message {
-            background-color: #f5f5f5;
-        }
-        .message-label {
-            font-weight: bold;
-            margin-bottom: 5px;
-        }
-        #input-container {
-            display: flex;
-            gap: 10px;
-        }
-        #message-input {
-            flex: 1;
-            padding: 10px;
-            border: 1px solid #ccc;
-            border-radius: 5px;
-        }
-        #send-button {
-            padding: 10px 20px;
-            background-color: #4CAF50;
-            color: white;
-            border: none;
-            border-radius: 5px;
-            cursor: pointer;
-        }
-        #send-button:disabled {
-            background-color: #ccc;
-            cursor: not-allowed;
-        }
-        .back-link {
-            margin-top: 20px;
-        }
-    </style>
+    <link rel="stylesheet" href="/static/chat.css?v={css_version}">
+    <script defer src="/static/chat.js?v={js_version}"></script>
 </head>
 <body>
     <h1>Chat with AI Assistant</h1>
@@ -213,121 +191,74 @@ CHAT_HTML = """<!DOCTYPE html>
     <div class="back-link">
         <a href="/">Back to Home</a>
     </div>
+</body>
+</html>"""
 
-    <script>
-        const chatContainer = document.getElementById('chat-container');
-        const messageInput = document.getElementById('message-input');
-        const sendButton = document.getElementById('send-button');
-
-        function addMessage(text, isUser) {
-            const messageDiv = document.createElement('div');
-            messageDiv.className = isUser ? 'message user-message' : 'message assistant-message';
-            
-            const label = document.createElement('div');
-            label.className = 'message-label';
-            label.textContent = isUser ? 'You:' : 'Assistant:';
-            
-            const content = document.createElement('div');
-            content.textContent = text;
-            
-            messageDiv.appendChild(label);
-            messageDiv.appendChild(content);
-            chatContainer.appendChild(messageDiv);
-            chatContainer.scrollTop = chatContainer.scrollHeight;
-        }
+LOGIN_PROMPT_BODY = LOGIN_PROMPT_HTML.encode()
+TELEGRAM_SUCCESS_BODY = TELEGRAM_SUCCESS_HTML.encode()
+CHAT_BODY = CHAT_HTML.format(
+    css_version=static_asset_version('chat.css'), js_version=static_asset_version('chat.js')
+).encode()
+NO_EVENTS_BODY = NO_EVENTS_HTML.encode()
 
-        async function sendMessage() {
-            const message = messageInput.value.trim();
-            if (!message) return;
-
-            addMessage(message, true);
-            messageInput.value = '';
-            sendButton.disabled = true;
-
-            try {
-                const response = await fetch('/chat/message', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({ message: message })
-                });
-
-                if (!response.ok) {
-                    throw new Error('Network response was not ok');
-                }
-
-                const data = await response.json();
-                addMessage(data.response, false);
-            } catch (error) {
-                addMessage('Error: Failed to send message', false);
-            } finally {
-                sendButton.disabled = false;
-                messageInput.focus();
-            }
-        }
+render_homepage = compile_template(HOMEPAGE_HTML)
+render_create_event_form = compile_template(CREATE_EVENT_FORM_HTML)
+render_event_created = compile_template(EVENT_CREATED_HTML)
+render_events_list = compile_template(EVENTS_LIST_HTML)
+render_event_list_item = compile_template(EVENT_LIST_ITEM_HTML)
+render_auth_error = compile_template(AUTH_ERROR_HTML)
+render_validation_error = compile_template(VALIDATION_ERROR_HTML)
+render_generic_error = compile_template(GENERIC_ERROR_HTML)
 
-        sendButton.addEventListener('click', sendMessage);
-        messageInput.addEventListener('keypress', (e) => {
-            if (e.key === 'Enter') {
-                sendMessage();
-            }
-        });
 
-        messageInput.focus();
-    </script>
-</body>
-</html>"""
+class ImmutableStaticFiles(StaticFiles):
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+        return response
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
 
 
 def create_error_response(error_message: str, status_code: int) -> Response:
-    return HTMLResponse(AUTH_ERROR_HTML.format(message=error_message), status_code=status_code)
+    return HTMLResponse(render_auth_error(message=error_message), status_code=status_code)
 
 
 async def homepage(request: Request):
-    validator = WebValidator(raises=False)
-    user = validator.get_user_from_session(request)
+    user = get_user_from_session(request)
 
     if not user:
-        return HTMLResponse(LOGIN_PROMPT_HTML)
+        return HTMLResponse(LOGIN_PROMPT_BODY)
 
     return HTMLResponse(
-        HOMEPAGE_HTML.format(
+        render_homepage(
             name=user.get('name', 'User'), email=user.get('email'), picture=user.get('picture')
         )
     )
 
 
 async def logout(request: Request):
-    request.session.pop('user', None)
-    request.session.pop('token', None)
+    request.session.clear()
     return RedirectResponse(url='/')
 
 
 async def telegram_success(request: Request):
-    return HTMLResponse(TELEGRAM_SUCCESS_HTML)
+    return HTMLResponse(TELEGRAM_SUCCESS_BODY)
 
 
 async def chat_page(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if validator.has_errors():
+    if not is_authenticated(request):
         return RedirectResponse(url='/login')
 
-    return HTMLResponse(CHAT_HTML)
+    return HTMLResponse(CHAT_BODY)
 
 
 async def chat_message(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if validator.has_errors():
-        return Response(
-            content=json.dumps({'error': 'Not authenticated'}),
-            media_type='application/json',
-            status_code=401,
-        )
+    if not is_authenticated(request):
+        return ORJSONResponse({'error': 'Not authenticated'}, status_code=401)
 
     state = request.app.state
     agent_manager = state.agent_manager
@@ -339,130 +270,111 @@ async def chat_message(request: Request):
     user_email = user.get('email', 'unknown')
 
     if not google_sub:
-        return Response(
-            content=json.dumps({'error': 'User ID not found'}),
-            media_type='application/json',
-            status_code=401,
-        )
+        return ORJSONResponse({'error': 'User ID not found'}, status_code=401)
 
     try:
-        body = await request.json()
-        user_message = body.get('message', '')
+        body, token_data = await asyncio.gather(
+            request.body(), storage_manager.get_user_token(google_sub)
+        )
+        user_message = orjson.loads(body).get('message', '')
         if not user_message:
-            return Response(
-                content=json.dumps({'error': 'Message is required'}),
-                media_type='application/json',
-                status_code=400,
-            )
+            return ORJSONResponse({'error': 'Message is required'}, status_code=400)
 
         logger(f'User {google_sub} sent message: {user_message}', 'info')
 
         response = await handlers.run_agent(
             agent_manager,
-            storage_manager,
+            token_data,
             google_sub,
             user_email,
             user_message,
         )
 
-        return Response(content=json.dumps({'response': response}), media_type='application/json')
+        return ORJSONResponse({'response': response})
 
     except ValueError as e:
         logger(f'Error processing chat message: {str(e)}', 'error')
-        return Response(
-            content=json.dumps({'error': str(e)}), media_type='application/json', status_code=400
-        )
+        return ORJSONResponse({'error': str(e)}, status_code=400)
     except Exception as e:
         logger(f'Error processing chat message: {str(e)}', 'error')
-        return Response(
-            content=json.dumps({'error': 'Internal server error'}),
-            media_type='application/json',
-            status_code=500,
-        )
+        return ORJSONResponse({'error': 'Internal server error'}, status_code=500)
 
 
 async def web_create_event_form(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if validator.has_errors():
+    if not is_authenticated(request):
         return RedirectResponse(url='/login')
 
     start_default, end_default = handlers.get_create_event_form_defaults()
 
     return HTMLResponse(
-        CREATE_EVENT_FORM_HTML.format(
+        render_create_event_form(
             start_time=start_default.isoformat()[:16], end_time=end_default.isoformat()[:16]
         )
     )
 
 
 async def web_create_event_post(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if validator.has_errors():
+    if not is_authenticated(request):
         return RedirectResponse(url='/login')
 
-    form_data = await request.form()
     state = request.app.state
     google_services_manager = state.google_services_manager
     logger: LogFunction = state.logger
 
-    validator = WebValidator(raises=False)
-    validator.event_form_valid(dict(form_data)).execute()
+    try:
+        body = (await request.body()).decode(errors='strict')
+        form_pairs = parse_qsl(body, keep_blank_values=True, errors='strict')
 
-    access_token = validator.get_access_token_from_session(request)
-    if not access_token or validator.has_errors():
-        return create_error_response(str(validator.get_errors()), 401)
+        validator = WebValidator(raises=False)
+        validator.event_form_valid(form_pairs).execute()
 
-    form_data_validated = validator.get_form_data()
+        access_token = validator.get_access_token_from_session(request)
+        if not access_token or validator.has_errors():
+            return create_error_response(str(validator.get_errors()), 401)
 
-    # Get user's timezone from session, default to UTC if not available
-    user = request.session.get('user', {})
-    user_timezone = user.get('timezone', 'UTC')
+        form_data_validated = validator.get_form_data()
+
+        user_timezone = get_session_timezone(request)
 
-    try:
         event = await handlers.create_calendar_event(
             google_services_manager,
             logger,
             access_token,
             form_data_validated['summary'],
-            f'{form_data_validated["start_time"]}:00',
-            f'{form_data_validated["end_time"]}:00',
+            form_data_validated['start_dt'],
+            form_data_validated['end_dt'],
             form_data_validated['description'],
             user_timezone,
         )
         html_link = event.get('htmlLink', '#')
-        return HTMLResponse(EVENT_CREATED_HTML.format(link=html_link))
+        return HTMLResponse(render_event_created(link=html_link))
 
     except WebValidationError as ve:
-        return HTMLResponse(VALIDATION_ERROR_HTML.format(message=str(ve)), status_code=400)
+        return HTMLResponse(render_validation_error(message=str(ve)), status_code=400)
+    except UnicodeDecodeError:
+        return HTMLResponse(
+            render_validation_error(message='Form data must be UTF-8 encoded'), status_code=400
+        )
     except Exception as e:
         logger(f'Error creating event: {str(e)}', 'error')
         return HTMLResponse(
-            GENERIC_ERROR_HTML.format(message=f'Error creating event: {str(e)}'), status_code=500
+            render_generic_error(message=f'Error creating event: {str(e)}'), status_code=500
         )
 
 
 async def web_list_events(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if validator.has_errors():
+    if not is_authenticated(request):
         return RedirectResponse(url='/login')
 
-    access_token = validator.get_access_token_from_session(request)
-    if not access_token or validator.has_errors():
+    access_token = get_access_token_from_session(request)
+    if not access_token:
         return RedirectResponse(url='/login')
 
     state = request.app.state
     google_services_manager = state.google_services_manager
     logger: LogFunction = state.logger
 
-    # Get user's timezone from session, default to UTC if not available
-    user = request.session.get('user', {})
-    user_timezone = user.get('timezone', 'UTC')
+    user_timezone = get_session_timezone(request)
 
     try:
         events = await handlers.list_calendar_events(
@@ -472,32 +384,29 @@ async def web_list_events(request: Request):
         )
 
         if not events:
-            events_html = NO_EVENTS_HTML
+            events_html = NO_EVENTS_BODY
         else:
-            items = []
+            items = [b'<ul>']
             for event in events:
-                start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
+                event_start = event.get('start', {})
+                start = event_start.get('dateTime') or event_start.get('date')
                 summary = event.get('summary', '(No Title)')
                 html_link = event.get('htmlLink', '#')
-                items.append(
-                    EVENT_LIST_ITEM_HTML.format(start=start, link=html_link, summary=summary)
-                )
-            events_html = '<ul>' + ''.join(items) + '</ul>'
+                items.append(render_event_list_item(start=start, link=html_link, summary=summary))
+            items.append(b'</ul>')
+            events_html = b''.join(items)
 
-        return HTMLResponse(EVENTS_LIST_HTML.format(events=events_html))
+        return HTMLResponse(render_events_list(events=events_html))
 
     except Exception as e:
         logger(f'Error listing events: {str(e)}', 'error')
         return HTMLResponse(
-            GENERIC_ERROR_HTML.format(message=f'Error listing events: {str(e)}'), status_code=500
+            render_generic_error(message=f'Error listing events: {str(e)}'), status_code=500
         )
 
 
 async def login(request: Request):
-    validator = WebValidator(raises=False)
-    validator.user_authenticated(request).execute()
-
-    if not validator.has_errors():
+    if is_authenticated(request):
         return RedirectResponse(url='/')
 
     telegram_id = request.query_params.get('telegram_id')
@@ -509,7 +418,7 @@ async def login(request: Request):
     if from_telegram:
         request.session['from_telegram'] = from_telegram
 
-    redirect_uri = build_redirect_uri(config_manager.redirect_url)
+    redirect_uri = request.app.state.redirect_uri
 
     return await oauth.google.authorize_redirect(
         request, redirect_uri, access_type='offline', prompt='consent'
@@ -522,15 +431,15 @@ async def auth(request: Request):
 
     validator = WebValidator(raises=WebValidationError)
 
-    if not validator.session_exists(request).execute():
+    try:
+        validator.session_exists(request).execute()
+    except WebValidationError:
         return create_error_response(
             'Session lost. This can happen when switching domains, blocking cookies, or using HTTP with secure cookies.',
             400,
         )
 
-    validator = WebValidator(raises=WebValidationError)
     await validator.oauth_authorize_token(oauth, request)
-    validator.ensure_token_expiry_set()
 
     try:
         validator.execute()
@@ -544,14 +453,14 @@ async def auth(request: Request):
         return create_error_response('Failed to get token', 401)
 
     try:
-        WebValidator(raises=WebValidationError).user_info_present(token).execute()
+        validator.user_info_present(token).execute()
     except WebValidationError as e:
         return create_error_response(str(e), 500)
 
     user = token.get('userinfo')
     logger(f'User logged in: {user}', 'info')
-    request.session['user'] = user
-    request.session['token'] = token
+    request.session['user'] = pick(user, SESSION_USER_KEYS)
+    request.session['token'] = pick(token, SESSION_TOKEN_KEYS)
 
     google_sub = user.get('sub')
     if google_sub:
@@ -575,12 +484,13 @@ async def auth(request: Request):
 
 
 middleware = [
+    Middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL),
     Middleware(
         SessionMiddleware,
         secret_key=config_manager.secret_key,
         https_only=not config_manager.debug,
         same_site='lax' if config_manager.debug else 'strict',
-    )
+    ),
 ]
 
 routes = [
@@ -594,6 +504,7 @@ routes = [
     Route('/create-event', web_create_event_form, methods=['GET']),
     Route('/create-event', web_create_event_post, methods=['POST']),
     Route('/events', web_list_events, methods=['GET']),
+    Mount('/static', app=ImmutableStaticFiles(packages=[STATIC_PACKAGE]), name='static'),
 ]
 
 
@@ -612,5 +523,6 @@ def create_app(
     app.state.google_services_manager = google_services_manager
     app.state.http_client = http_client
     app.state.logger = logger
+    app.state.redirect_uri = build_redirect_uri(config_manager.redirect_url)
     app.state.bot_application = bot_application
     return app
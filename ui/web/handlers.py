@@ -1,10 +1,9 @@
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from typing import Any
 
 from managers.agent_manager import AgentManager
 from managers.google_services_manager import GoogleServicesManager
-from managers.storage_manager import StorageManager
-from utils import LogFunction
+from utils import LogFunction, get_zoneinfo
 
 
 def get_create_event_form_defaults() -> tuple[datetime, datetime]:
@@ -19,16 +18,14 @@ async def create_calendar_event(
     logger: LogFunction,
     access_token: str,
     summary: str,
-    start_time: str,
-    end_time: str,
+    start_dt: datetime,
+    end_dt: datetime,
     description: str,
     event_timezone: str,
 ):
     logger(f'Creating calendar event: "{summary}"', 'info')
 
-    start_dt = datetime.fromisoformat(start_time)
-    end_dt = datetime.fromisoformat(end_time)
-    tz = ZoneInfo(event_timezone)
+    tz = get_zoneinfo(event_timezone)
 
     event = await google_services_manager.create_calendar_event(
         access_token,
@@ -46,20 +43,19 @@ async def list_calendar_events(
     access_token: str,
     user_timezone: str,
 ):
-    now = datetime.now(ZoneInfo(user_timezone))
-    tz = ZoneInfo(user_timezone)
+    tz = get_zoneinfo(user_timezone)
+    now = datetime.now(tz)
     events = await google_services_manager.list_upcoming_events(access_token, now, tz)
     return events
 
 
 async def run_agent(
     agent_manager: AgentManager,
-    storage_manager: StorageManager,
+    token_data: dict[str, Any] | None,
     google_sub: str,
     user_email: str,
     user_message: str,
 ):
-    token_data = await storage_manager.get_user_token(google_sub)
     if not token_data:
         raise ValueError('User not authenticated')
 
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Callable
+import re
+from typing import Any, Callable, Iterable
 
 from authlib.integrations.starlette_client import OAuth
 from starlette.requests import Request
@@ -9,17 +10,31 @@ from starlette.requests import Request
 from ui.base import BaseValidator, Errors, ValidationError, noop_on_errors
 from validation import ensure_token_expiry, is_token_valid
 
+DATETIME_LOCAL_PATTERN = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2})')
+
 
 class WebValidationError(ValidationError):
     pass
 
 
+def parse_datetime_local(value: str) -> datetime | None:
+    match = DATETIME_LOCAL_PATTERN.fullmatch(value)
+    if not match:
+        return None
+
+    year, month, day, hour, minute = map(int, match.groups())
+    try:
+        return datetime(year, month, day, hour, minute)
+    except ValueError:
+        return None
+
+
 class WebValidator(BaseValidator):
     def __init__(
         self, raises: bool | type[Exception], on_errors: Callable[[Errors], None] = noop_on_errors
     ):
         super().__init__(raises, on_errors)
-        self._form_data: dict[str, str] | None = None
+        self._form_data: dict[str, Any] | None = None
         self._token: dict[str, Any] | None = None
 
     def has_errors(self) -> bool:
@@ -28,7 +43,7 @@ class WebValidator(BaseValidator):
     def get_errors(self) -> Errors:
         return self._errors
 
-    def get_form_data(self) -> dict[str, str]:
+    def get_form_data(self) -> dict[str, Any]:
         if self._form_data is None:
             raise ValueError('Form data not validated')
         return self._form_data
@@ -36,9 +51,6 @@ class WebValidator(BaseValidator):
     def get_token(self) -> dict[str, Any] | None:
         return self._token
 
-    def get_user_from_session(self, request: Request) -> dict[str, Any] | None:
-        return request.session.get('user')
-
     def get_access_token_from_session(self, request: Request) -> str:
         token = request.session.get('token')
         if not token:
@@ -50,23 +62,6 @@ class WebValidator(BaseValidator):
 
         return access_token
 
-    def user_authenticated(self, request: Request) -> WebValidator:
-        user = request.session.get('user')
-        token = request.session.get('token')
-
-        if not user:
-            self._add_error('User not found in session')
-            return self
-
-        if not token:
-            self._add_error('Token not found in session')
-            return self
-
-        if not is_token_valid(token):
-            self._add_error('Token has expired')
-
-        return self
-
     def session_exists(self, request: Request) -> WebValidator:
         if not request.session:
             self._add_error('Session not found. Cookies may be blocked or session expired')
@@ -90,11 +85,18 @@ class WebValidator(BaseValidator):
             self._add_error('User information not found in token data')
         return self
 
-    def event_form_valid(self, form_data: dict) -> WebValidator:
-        summary = form_data.get('summary', '').strip()
-        start_time = form_data.get('start_time', '').strip()
-        end_time = form_data.get('end_time', '').strip()
-        description = form_data.get('description', '').strip()
+    def event_form_valid(self, form_pairs: Iterable[tuple[str, str]]) -> WebValidator:
+        summary = start_time = end_time = description = ''
+        for name, value in form_pairs:
+            match name:
+                case 'summary':
+                    summary = value.strip()
+                case 'start_time':
+                    start_time = value.strip()
+                case 'end_time':
+                    end_time = value.strip()
+                case 'description':
+                    description = value.strip()
 
         if not summary:
             self._add_error('Summary is required')
@@ -106,15 +108,13 @@ class WebValidator(BaseValidator):
             self._add_error('End time is required')
 
         if not self._errors:
-            try:
-                start_dt = datetime.fromisoformat(start_time)
-            except ValueError:
+            start_dt = parse_datetime_local(start_time)
+            if start_dt is None:
                 self._add_error('Invalid start time format')
                 return self
 
-            try:
-                end_dt = datetime.fromisoformat(end_time)
-            except ValueError:
+            end_dt = parse_datetime_local(end_time)
+            if end_dt is None:
                 self._add_error('Invalid end time format')
                 return self
 
@@ -124,8 +124,8 @@ class WebValidator(BaseValidator):
 
             self._form_data = {
                 'summary': summary,
-                'start_time': start_time,
-                'end_time': end_time,
+                'start_dt': start_dt,
+                'end_dt': end_dt,
                 'description': description,
             }
 
@@ -141,11 +141,6 @@ class WebValidator(BaseValidator):
 
         return self
 
-    def ensure_token_expiry_set(self) -> WebValidator:
-        if self._token:
-            self._token = ensure_token_expiry(self._token)
-        return self
-
 
 def validate_event_form(form_data: dict) -> dict[str, str]:
     validator = WebValidator(raises=WebValidationError)
@@ -166,15 +161,13 @@ def validate_event_form(form_data: dict) -> dict[str, str]:
 
     validator.execute()
 
-    try:
-        start_dt = datetime.fromisoformat(start_time)
-    except ValueError as exc:
-        raise WebValidationError('Invalid start time format') from exc
+    start_dt = parse_datetime_local(start_time)
+    if start_dt is None:
+        raise WebValidationError('Invalid start time format')
 
-    try:
-        end_dt = datetime.fromisoformat(end_time)
-    except ValueError as exc:
-        raise WebValidationError('Invalid end time format') from exc
+    end_dt = parse_datetime_local(end_time)
+    if end_dt is None:
+        raise WebValidationError('Invalid end time format')
 
     if end_dt <= start_dt:
         raise WebValidationError('End time must be after start time')
@@ -197,10 +190,27 @@ async def validate_oauth_token(oauth: OAuth, request: Request) -> dict[str, Any]
     return ensure_token_expiry(token)
 
 
+def is_authenticated(request: Request) -> bool:
+    session = request.session
+    if not session.get('user'):
+        return False
+
+    token = session.get('token')
+    if not token:
+        return False
+
+    return is_token_valid(token)
+
+
 def get_user_from_session(request: Request) -> dict[str, Any] | None:
     return request.session.get('user')
 
 
+def get_session_timezone(request: Request) -> str:
+    user = request.session.get('user')
+    return user.get('timezone', 'UTC') if user else 'UTC'
+
+
 def get_access_token_from_session(request: Request) -> str:
     token = request.session.get('token')
     if not token:
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from string import Formatter
+from time import monotonic, time
+from typing import Any, Callable, Generic, Protocol, Sequence, TypeVar
+from zoneinfo import ZoneInfo
+
+
+def noop_log(_message: str, _level: str, *_args: object) -> None:
+    pass
+
+
+NOOP_LOG = noop_log
+
+
+class LogFunction(Protocol):
+    def __call__(self, message: str, level: str, *args: object) -> None: ...
+
+
+T = TypeVar('T', bound=dict[str, Any])
+V = TypeVar('V')
+
+
+def pick(source: dict[str, Any], keys: Sequence[str]) -> T:
+    """
+    Creates a new dictionary with only the specified keys from the source dictionary.
+    Only includes keys that exist in the source dictionary.
+
+    Args:
+        source: The source dictionary to pick from
+        keys: Sequence of keys to include in the result
+
+    Returns:
+        A new dictionary containing only the specified keys that exist in source
+    """
+    return {key: source[key] for key in keys if key in source}  # type: ignore[return-value]
+
+
+def compile_template(template: str) -> Callable[..., bytes]:
+    parts = [
+        (literal.encode(), field_name)
+        for literal, field_name, _spec, _conversion in Formatter().parse(template)
+    ]
+
+    def render(**fields: object) -> bytes:
+        chunks: list[bytes] = []
+        for literal, field_name in parts:
+            chunks.append(literal)
+            if field_name is not None:
+                value = fields[field_name]
+                chunks.append(value if isinstance(value, bytes) else str(value).encode())
+        return b''.join(chunks)
+
+    return render
+
+
+class TTLCache(Generic[V]):
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: dict[str, tuple[V, float]] = {}
+
+    def get(self, key: str) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, deadline = entry
+        if deadline <= monotonic():
+            del self._entries[key]
+            return None
+
+        return value
+
+    def set(self, key: str, value: V, ttl: float) -> None:
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (value, monotonic() + ttl)
+        if len(self._entries) > self._maxsize:
+            del self._entries[next(iter(self._entries))]
+
+    def pop(self, key: str) -> V | None:
+        value = self.get(key)
+        self._entries.pop(key, None)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class LRUCache(Generic[V]):
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, V] = OrderedDict()
+
+    def get(self, key: str) -> V | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+@lru_cache(maxsize=512)
+def get_zoneinfo(key: str) -> ZoneInfo:
+    return ZoneInfo(key)
+
+
+@lru_cache(maxsize=1)
+def format_local_timestamp(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def get_current_datetime() -> str:
+    return format_local_timestamp(int(time()))
@@ -0,0 +1,174 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+import random
+from time import monotonic, time
+
+import httpx
+
+from utils import NOOP_LOG, LogFunction
+
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'})
+
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+
+class CircuitOpenError(httpx.TransportError):
+    pass
+
+
+def backoff_windows(max_retries: int) -> tuple[float, ...]:
+    return tuple(min(BACKOFF_CAP, BACKOFF_BASE * (1 << attempt)) for attempt in range(max_retries))
+
+
+def parse_retry_after(value: str | None, now: float) -> float | None:
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return seconds if seconds >= 0 else None
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - now, 0.0)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures: dict[str, int] = {}
+        self.open_until: dict[str, float] = {}
+        self.probing: set[str] = set()
+
+    def is_open(self, host: str) -> bool:
+        open_until = self.open_until.get(host)
+        if open_until is None:
+            return False
+        return monotonic() < open_until or host in self.probing
+
+    def claim_probe(self, host: str) -> bool:
+        if host not in self.open_until:
+            return False
+        self.probing.add(host)
+        return True
+
+    def record_success(self, host: str) -> None:
+        self.failures.pop(host, None)
+        self.open_until.pop(host, None)
+
+    def record_failure(self, host: str) -> bool:
+        failures = self.failures.get(host, 0) + 1
+        self.failures[host] = failures
+        if failures < self.threshold:
+            return False
+        self.open_until[host] = monotonic() + self.cooldown
+        return True
+
+    def release(self, host: str) -> None:
+        self.probing.discard(host)
+
+
+class RetryTransport(httpx.AsyncHTTPTransport):
+    def __init__(
+        self,
+        max_retries: int,
+        logger: LogFunction = NOOP_LOG,
+        *args,
+        retry_budget: float,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.logger = logger
+        self.backoff_windows = backoff_windows(max_retries)
+        self.breaker = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if self.breaker.is_open(host):
+            raise CircuitOpenError(f'Circuit open for {host}', request=request)
+        is_probe = self.breaker.claim_probe(host)
+
+        try:
+            response = await self.send_with_retries(request)
+        except httpx.TransportError:
+            self.record_failure(host)
+            raise
+        finally:
+            if is_probe:
+                self.breaker.release(host)
+
+        if response.status_code >= 500:
+            self.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        return response
+
+    def record_failure(self, host: str) -> None:
+        if self.breaker.record_failure(host):
+            self.logger('Circuit open for %s for %.0fs', 'warning', host, BREAKER_COOLDOWN)
+
+    async def send_with_retries(self, request: httpx.Request) -> httpx.Response:
+        replayable = request.method in IDEMPOTENT_METHODS or 'idempotency-key' in request.headers
+        deadline = monotonic() + self.retry_budget
+
+        for attempt, window in enumerate(self.backoff_windows):
+            is_last_attempt = attempt == self.max_retries - 1
+            try:
+                response = await super().handle_async_request(request)
+            except (httpx.PoolTimeout, httpx.ReadTimeout, httpx.RemoteProtocolError) as error:
+                resendable = replayable or isinstance(error, httpx.PoolTimeout)
+                delay = random.uniform(0, window)
+                if is_last_attempt or not resendable or delay > deadline - monotonic():
+                    raise
+                reason = type(error).__name__
+            else:
+                retryable = replayable and response.status_code in RETRY_STATUS_CODES
+                if not retryable or is_last_attempt:
+                    return response
+
+                reason = f'HTTP {response.status_code}'
+                retry_after = parse_retry_after(response.headers.get('retry-after'), time())
+                if retry_after is None:
+                    delay = random.uniform(0, window)
+                else:
+                    delay = min(retry_after, BACKOFF_CAP) + random.uniform(0, BACKOFF_BASE)
+                if delay > deadline - monotonic():
+                    return response
+                await response.aclose()
+
+            self.logger('%s, retry %d after %.2fs', 'warning', reason, attempt + 1, delay)
+            await asyncio.sleep(delay)
+
+        raise httpx.ConnectError('Failed to connect after multiple attempts')
+
+
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+HTTP_RETRY_BUDGET = 25.0
+HTTP_CONNECT_RETRIES = 2
+
+
+def create_http_client(logger: LogFunction = NOOP_LOG) -> httpx.AsyncClient:
+    transport = RetryTransport(
+        max_retries=3,
+        logger=logger,
+        retry_budget=HTTP_RETRY_BUDGET,
+        limits=HTTP_LIMITS,
+        http2=True,
+        retries=HTTP_CONNECT_RETRIES,
+    )
+    return httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
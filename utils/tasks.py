@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Coroutine, TypeVar
+
+T = TypeVar('T')
+
+
+class TaskCoordinator:
+    def __init__(self, concurrency: int):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.lock_waiters: dict[str, int] = {}
+        self.tasks: dict[str, asyncio.Task[Any]] = {}
+        self.timers: dict[str, asyncio.TimerHandle] = {}
+        self.closing = False
+
+    @asynccontextmanager
+    async def exclusive(self, key: str) -> AsyncIterator[None]:
+        lock = self.locks.setdefault(key, asyncio.Lock())
+        self.lock_waiters[key] = self.lock_waiters.get(key, 0) + 1
+        try:
+            async with lock, self.slots:
+                yield
+        finally:
+            self.lock_waiters[key] -= 1
+            if not self.lock_waiters[key]:
+                del self.lock_waiters[key]
+                del self.locks[key]
+
+    def get_task(self, key: str) -> asyncio.Task[Any] | None:
+        return self.tasks.get(key)
+
+    def start_task(self, key: str, coroutine: Coroutine[Any, Any, T]) -> asyncio.Task[T]:
+        task = asyncio.ensure_future(coroutine)
+        self.tasks[key] = task
+        task.add_done_callback(partial(self.forget_task, key))
+        return task
+
+    def forget_task(self, key: str, task: asyncio.Task[Any]) -> None:
+        if self.tasks.get(key) is task:
+            del self.tasks[key]
+
+    def start_task_later(
+        self, key: str, delay: float, start: Callable[[], Coroutine[Any, Any, Any]]
+    ) -> None:
+        if self.closing or key in self.timers:
+            return
+        self.timers[key] = asyncio.get_running_loop().call_later(delay, self.fire_timer, key, start)
+
+    def fire_timer(self, key: str, start: Callable[[], Coroutine[Any, Any, Any]]) -> None:
+        del self.timers[key]
+        self.start_task(key, start())
+
+    async def shutdown(self) -> None:
+        self.closing = True
+        for handle in self.timers.values():
+            handle.cancel()
+        self.timers.clear()
+
+        while self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
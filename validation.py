@@ -1,7 +1,9 @@
 from time import time
 
+TOKEN_EXPIRY_SKEW = 300
 
-def is_token_valid(token_data: dict) -> bool:
+
+def is_token_valid(token_data: dict | None) -> bool:
     if not token_data:
         return False
 
@@ -9,8 +11,7 @@ def is_token_valid(token_data: dict) -> bool:
     if not expires_at:
         return False
 
-    current_time = int(time())
-    return current_time < expires_at
+    return time() + TOKEN_EXPIRY_SKEW < expires_at
 
 
 def ensure_token_expiry(token: dict) -> dict: